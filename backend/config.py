@@ -51,6 +51,7 @@ class LLMSettings(BaseModel):
     max_tokens: int = Field(4096, description="Maximum tokens per request")
     temperature: float = Field(0.2, description="Temperature for generation")
     max_concurrent_requests: int = Field(5, description="Maximum concurrent requests")
+    requests_per_minute: int = Field(500, description="Maximum LLM requests started per minute (0 = unlimited)")
     request_timeout: int = Field(60, description="Request timeout in seconds")
 
 
@@ -66,6 +67,11 @@ class AppConfig(BaseModel):
     base_logs_dir: str = Field("init_logs", description="Base directory for logs")
     script_version: str = Field("3.0.0", description="Current script version")
     
+    # Parameter cache (stored in base_logs_dir, shared across runs)
+    parameter_cache_enabled: bool = Field(True, description="Reuse parameters previously generated for an identical actor prompt")
+    parameter_cache_semantic: bool = Field(False, description="Also reuse parameters of similar actors (same type, similar description)")
+    parameter_cache_similarity: float = Field(0.92, description="Minimum description similarity for a semantic cache hit")
+    
     # API settings
     api_host: str = Field("localhost", description="API host")
     api_port: int = Field(8000, description="API port")
@@ -1,8 +1,17 @@
+import hashlib
 import os
-from datetime import datetime
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Dict, Optional, Any
 import json
 
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+# Retry settings for transient API failures (rate limits, connection drops, 5xx)
+MAX_API_ATTEMPTS = 6
+MAX_RETRY_WAIT = 30.0
+
 # Cost tracking variables
 cost_session = {
     "total_cost": 0.0,
@@ -45,6 +54,47 @@ PROVIDER_PRICING = {
     }
 }
 
+# Maximum output tokens per request (model name prefix -> limit); most specific prefix first
+MODEL_OUTPUT_TOKEN_LIMITS = {
+    "openai": {
+        "gpt-4o-mini": 16384,
+        "gpt-4o": 16384,
+        "gpt-4-turbo": 4096,
+        "gpt-4-32k": 8192,
+        "gpt-4": 8192,
+        "gpt-3.5-turbo": 4096,
+        "default": 4096
+    },
+    "anthropic": {
+        "claude-3-5-sonnet": 8192,
+        "claude-3-5-haiku": 8192,
+        "claude-3": 4096,
+        "default": 4096
+    }
+}
+
+def max_output_tokens(provider: str, model: str) -> int:
+    """Largest max_tokens the given model accepts (conservative default for unknown models)"""
+    limits = MODEL_OUTPUT_TOKEN_LIMITS.get(provider.lower(), {"default": 4096})
+    model = model.lower()
+    for prefix, limit in limits.items():
+        if model.startswith(prefix):
+            return limit
+    return limits["default"]
+
+# OpenAI models that accept a strict json_schema response_format (older ones reject it with a 400)
+OPENAI_STRUCTURED_OUTPUT_PREFIXES = ("gpt-4o", "gpt-4.1")
+
+def supports_structured_output(provider: str, model: str) -> bool:
+    """Whether call_llm_api can pin this model's response to a json_schema"""
+    provider = provider.lower()
+    if provider == "anthropic":
+        # Sent as a forced tool call, which every Claude 3+ model supports
+        return True
+    if provider == "openai":
+        return model.lower().startswith(OPENAI_STRUCTURED_OUTPUT_PREFIXES)
+    return False
+
 def calculate_cost(provider: str, model: str, input_tokens: int, output_tokens: int) -> float:
     """Calculate the cost for a specific API call"""
     provider_key = provider.lower()
@@ -243,7 +293,113 @@ def log_llm_error(provider, model, error_type, error_message):
     timestamp = datetime.now().strftime("%H:%M:%S")
     print(f"❌ [{timestamp}] LLM API call failed - {provider}:{model} ({error_type}: {error_message})")
 
-def call_llm_api(prompt, model_provider, model_name, **kwargs):
+@lru_cache(maxsize=1)
+def _retryable_error_types() -> tuple:
+    """Collect the transient error classes of whichever provider SDKs are installed"""
+    error_types = []
+    try:
+        import openai
+        error_types += [openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError]
+    except ImportError:
+        pass
+    try:
+        import anthropic
+        error_types += [anthropic.RateLimitError, anthropic.APIConnectionError, anthropic.InternalServerError]
+    except ImportError:
+        pass
+    return tuple(error_types)
+
+def _is_retryable_error(exception: BaseException) -> bool:
+    """Rate limits, connection errors/timeouts and 5xx responses are worth retrying"""
+    return isinstance(exception, _retryable_error_types())
+
+_exponential_wait = wait_exponential_jitter(initial=1, max=MAX_RETRY_WAIT)
+
+# (remaining, reset) header pairs for each rate-limit window: OpenAI, then Anthropic
+_RATE_LIMIT_HEADERS = (
+    ("x-ratelimit-remaining-requests", "x-ratelimit-reset-requests"),
+    ("x-ratelimit-remaining-tokens", "x-ratelimit-reset-tokens"),
+    ("anthropic-ratelimit-requests-remaining", "anthropic-ratelimit-requests-reset"),
+    ("anthropic-ratelimit-tokens-remaining", "anthropic-ratelimit-tokens-reset"),
+    ("anthropic-ratelimit-input-tokens-remaining", "anthropic-ratelimit-input-tokens-reset"),
+    ("anthropic-ratelimit-output-tokens-remaining", "anthropic-ratelimit-output-tokens-reset"),
+)
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+def _seconds_until_reset(value: str) -> Optional[float]:
+    """A reset header as seconds from now: an OpenAI duration ("6m0s", "20ms") or an RFC 3339 time (Anthropic)"""
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(number + unit for number, unit in parts) == value:
+        return sum(float(number) * _DURATION_SECONDS[unit] for number, unit in parts)
+    try:
+        reset_at = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if reset_at.tzinfo is None:
+        return None
+    return (reset_at - datetime.now(timezone.utc)).total_seconds()
+
+def _rate_limit_reset_wait(headers) -> Optional[float]:
+    """Seconds until every exhausted rate-limit window (remaining == 0) has reset, if the headers say"""
+    waits = []
+    for remaining_header, reset_header in _RATE_LIMIT_HEADERS:
+        remaining, reset = headers.get(remaining_header), headers.get(reset_header)
+        if remaining is None or reset is None:
+            continue
+        try:
+            if float(remaining) > 0:
+                continue
+        except ValueError:
+            continue
+        wait = _seconds_until_reset(reset)
+        if wait is not None:
+            waits.append(wait)
+    return max(waits) if waits else None
+
+def _wait_for_retry(retry_state) -> float:
+    """
+    Honor the provider's retry-after headers, then the reset time of an exhausted
+    x-ratelimit-remaining-* / anthropic-ratelimit-*-remaining window, otherwise back
+    off exponentially with jitter.
+    """
+    exception = retry_state.outcome.exception()
+    headers = getattr(getattr(exception, "response", None), "headers", None) or {}
+    
+    try:
+        if headers.get("retry-after-ms"):
+            return min(float(headers["retry-after-ms"]) / 1000, MAX_RETRY_WAIT)
+        if headers.get("retry-after"):
+            return min(float(headers["retry-after"]), MAX_RETRY_WAIT)
+    except ValueError:
+        # retry-after may also be an HTTP date - try the rate-limit headers instead
+        pass
+    
+    reset_wait = _rate_limit_reset_wait(headers)
+    if reset_wait is not None:
+        return min(max(reset_wait, 0.0), MAX_RETRY_WAIT)
+    
+    return _exponential_wait(retry_state)
+
+@lru_cache(maxsize=64)
+def _prompt_cache_key(system: str) -> str:
+    """Stable cache key for a system prompt, so OpenAI routes calls sharing it to the same prompt cache"""
+    return hashlib.blake2b(system.encode("utf-8"), digest_size=16).hexdigest()
+
+def _log_retry(retry_state):
+    """Print a short notice before sleeping between attempts"""
+    exception = retry_state.outcome.exception()
+    wait = retry_state.next_action.sleep if retry_state.next_action else 0
+    print(f"🔁 Retrying LLM API call in {wait:.1f}s (attempt {retry_state.attempt_number}/{MAX_API_ATTEMPTS}): {type(exception).__name__}")
+
+@retry(
+    retry=retry_if_exception(_is_retryable_error),
+    wait=_wait_for_retry,
+    stop=stop_after_attempt(MAX_API_ATTEMPTS),
+    before_sleep=_log_retry,
+    reraise=True
+)
+def call_llm_api(prompt, model_provider, model_name, system=None, json_schema=None, **kwargs):
     """
     Calls an LLM API (OpenAI or Anthropic) with the given prompt and model.
 
@@ -251,6 +407,14 @@ def call_llm_api(prompt, model_provider, model_name, **kwargs):
         prompt (str): The prompt to send to the LLM.
         model_provider (str): The provider name, e.g., "openai" or "anthropic".
         model_name (str): The model name to use.
+        system (str, optional): Static system prompt sent ahead of the user prompt.
+            Keeping it identical across calls lets the provider cache it
+            (prefix caching with a prompt_cache_key on OpenAI, an ephemeral cache block on Anthropic).
+        json_schema (dict, optional): {"name": ..., "schema": ...} the response must follow
+            (see models.structured_output_schema). Sent as a strict response_format on OpenAI
+            and as a forced tool call on Anthropic; either way the JSON text is returned.
+            Ignored for models where supports_structured_output is False - callers must then
+            describe the format in the prompt.
         **kwargs: Additional keyword arguments for the API call.
 
     Returns:
@@ -258,6 +422,9 @@ def call_llm_api(prompt, model_provider, model_name, **kwargs):
 
     Raises:
         ValueError: If the provider is not supported or required API key is missing.
+
+    Transient errors (rate limits, connection errors, 5xx) are retried up to
+    MAX_API_ATTEMPTS times, waiting for the provider's retry-after header when present.
     """
     if model_provider.lower() == "openai":
         try:
@@ -274,10 +441,21 @@ def call_llm_api(prompt, model_provider, model_name, **kwargs):
             raise ValueError(error_msg)
         
         try:
-            client = openai.OpenAI(api_key=api_key)
+            # Retries are handled by the decorator above, not by the SDK
+            client = openai.OpenAI(api_key=api_key, max_retries=0)
+            messages = [{"role": "user", "content": prompt}]
+            if system:
+                messages.insert(0, {"role": "system", "content": system})
+                # Sent via extra_body so older SDK versions without the argument still work
+                kwargs.setdefault("extra_body", {"prompt_cache_key": _prompt_cache_key(system)})
+            if json_schema and supports_structured_output(model_provider, model_name):
+                kwargs.setdefault("response_format", {
+                    "type": "json_schema",
+                    "json_schema": {"name": json_schema["name"], "schema": json_schema["schema"], "strict": True}
+                })
             response = client.chat.completions.create(
                 model=model_name,
-                messages=[{"role": "user", "content": prompt}],
+                messages=messages,
                 **kwargs
             )
             
@@ -310,14 +488,32 @@ def call_llm_api(prompt, model_provider, model_name, **kwargs):
             raise ValueError(error_msg)
         
         try:
-            client = anthropic.Anthropic(api_key=api_key)
+            client = anthropic.Anthropic(api_key=api_key, max_retries=0)
+            system_kwargs = {}
+            if system:
+                system_kwargs["system"] = [
+                    {"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}
+                ]
+            if json_schema:
+                # A single forced tool whose input is the structured response
+                system_kwargs["tools"] = [{
+                    "name": json_schema["name"],
+                    "description": "Record the response.",
+                    "input_schema": json_schema["schema"]
+                }]
+                system_kwargs["tool_choice"] = {"type": "tool", "name": json_schema["name"]}
             response = client.messages.create(
                 model=model_name,
                 max_tokens=kwargs.get("max_tokens", 1024),
-                messages=[{"role": "user", "content": prompt}]
+                messages=[{"role": "user", "content": prompt}],
+                **system_kwargs
             )
             
-            result = response.content[0].text.strip()
+            if json_schema:
+                tool_input = next(block.input for block in response.content if block.type == "tool_use")
+                result = json.dumps(tool_input)
+            else:
+                result = response.content[0].text.strip()
             
             # Extract usage information and calculate cost
             input_tokens, output_tokens = extract_usage_from_response(response, model_provider)
@@ -12,7 +12,7 @@ from typing import Dict, Any, Optional, List
 
 from fastapi import FastAPI, BackgroundTasks, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 # Add parent directory to path for imports
 import sys
@@ -25,7 +25,7 @@ from worldmodel.backend.models import (
 )
 from worldmodel.backend.services import get_generation_service
 from worldmodel.backend.utils import (
-    get_latest_run_folder, get_run_info, validate_generation_request,
+    get_latest_run_folder, get_run_info, load_level_data_bytes, validate_generation_request,
     log_info, log_error, log_warning
 )
 
@@ -309,34 +309,20 @@ async def get_run_data(level: int):
         raise HTTPException(status_code=404, detail="No runs found")
     
     # FORCE load the _with_params version for debugging
-    file_path = run_folder / f"Features_level_{level}_with_params.json"
+    # Files are forwarded as-is - no parse/re-serialize round trip
+    data = load_level_data_bytes(f"{level}_with_params", run_folder)
+    file_name = f"Features_level_{level}_with_params.json"
     
-    # Add logging to show which file is being served
-    print(f"🔍 Backend serving file: {file_path}")
-    print(f"📁 File exists: {file_path.exists()}")
-    
-    if not file_path.exists():
+    if data is None:
         print(f"⚠️  _with_params file not found, falling back to regular file")
-        file_path = run_folder / f"Features_level_{level}.json"
-        print(f"🔍 Backend serving fallback file: {file_path}")
-        print(f"📁 Fallback file exists: {file_path.exists()}")
+        data = load_level_data_bytes(level, run_folder)
+        file_name = f"Features_level_{level}.json"
     
-    if not file_path.exists():
+    if data is None:
         raise HTTPException(status_code=404, detail=f"Level {level} data not found")
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        print(f"✅ Successfully loaded {file_path.name}")
-        print(f"📊 Data contains {len(data.get('actors', []))} actors")
-        if data.get('actors'):
-            actor_keys = list(data['actors'][0].keys())
-            print(f"🔑 First actor keys: {actor_keys}")
-            print(f"📋 Has parameters: {'parameters' in actor_keys}")
-        return data
-    except Exception as e:
-        print(f"❌ Error loading {file_path.name}: {e}")
-        raise HTTPException(status_code=500, detail=f"Error reading data: {str(e)}")
+    print(f"🔍 Backend serving file: {run_folder / file_name} ({len(data):,} bytes)")
+    return Response(content=data, media_type="application/json")
 
 
 @app.get("/api/runs/data/{level_str}")
@@ -347,23 +333,11 @@ async def get_run_data_with_suffix(level_str: str):
     if not run_folder:
         raise HTTPException(status_code=404, detail="No runs found")
     
-    file_path = run_folder / f"Features_level_{level_str}.json"
-    
-    if not file_path.exists():
+    data = load_level_data_bytes(level_str, run_folder)
+    if data is None:
         raise HTTPException(status_code=404, detail=f"Level {level_str} data not found")
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return data
-    except Exception as e:
-        log_error(
-            error_type="DATA_LOAD_ERROR",
-            error_message=f"Failed to load level {level_str} data",
-            details=f"File: {file_path}",
-            exception=e
-        )
-        raise HTTPException(status_code=500, detail=f"Failed to load data: {str(e)}")
+    return Response(content=data, media_type="application/json")
 
 
 @app.get("/api/runs")
@@ -420,17 +394,37 @@ async def test_params():
     return result
 
 
+def _event_loop_impl() -> str:
+    """
+    Pick the uvicorn event loop: uvloop when it's available (not on Windows), else asyncio.
+    
+    The generation endpoints fan out hundreds of concurrent LLM calls, and uvloop's
+    cheaper awaits add up there. Run `uvicorn ... --loop uvloop` for the same effect
+    when starting the server some other way.
+    """
+    if sys.platform == "win32":
+        return "asyncio"
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        log_warning("uvloop not installed", "Falling back to the default asyncio event loop")
+        return "asyncio"
+    return "uvloop"
+
+
 if __name__ == "__main__":
     import uvicorn
     
+    loop_impl = _event_loop_impl()
     log_info(
         f"Starting World Model API server",
-        f"Host: {config.api_host}, Port: {config.api_port}"
+        f"Host: {config.api_host}, Port: {config.api_port}, Loop: {loop_impl}"
     )
     
     uvicorn.run(
            app, 
            host=config.api_host, 
            port=config.api_port,
+           loop=loop_impl,
            log_level="info"
        )
\ No newline at end of file
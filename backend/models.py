@@ -4,7 +4,7 @@ All Pydantic models for actors, sub-actors, and related data structures.
 """
 
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 
@@ -21,8 +21,15 @@ class ActorList(BaseModel):
     total_count: int = Field(..., description="Total number of actors in the list")
 
 
+# Actor-tree models are built in large numbers and never mutated after validation:
+# freeze them and build the schema once at import time
+_TREE_MODEL_CONFIG = ConfigDict(extra='ignore', revalidate_instances='never', defer_build=False, frozen=True)
+
+
 class SubActor(BaseModel):
     """Represents a sub-actor within a main actor"""
+    model_config = _TREE_MODEL_CONFIG
+
     name: str = Field(..., description="The name of the sub-actor")
     description: str = Field(..., description="A detailed description of the sub-actor's role and influence")
     type: str = Field(..., description="The type of sub-actor")
@@ -34,6 +41,8 @@ class SubActor(BaseModel):
 
 class SubActorList(BaseModel):
     """Container for a list of sub-actors"""
+    model_config = _TREE_MODEL_CONFIG
+
     sub_actors: List[SubActor] = Field(..., description="List of sub-actors")
     total_count: int = Field(..., description="Total number of sub-actors")
     parent_actor: str = Field(..., description="The parent actor")
@@ -41,6 +50,8 @@ class SubActorList(BaseModel):
 
 class EnhancedActor(BaseModel):
     """Enhanced actor model that includes sub-actors"""
+    model_config = _TREE_MODEL_CONFIG
+
     name: str = Field(..., description="The name of the actor")
     description: str = Field(..., description="A short description of the actor's role and influence")
     type: str = Field(..., description="The type of actor")
@@ -58,6 +69,35 @@ class ActorParameter(BaseModel):
     expected_value: str = Field(..., description="Example value or range")
 
 
+class ParameterSet(BaseModel):
+    """Structured-output schema: the parameters generated for one actor"""
+    parameters: List[ActorParameter] = Field(..., description="Parameters for the actor")
+
+
+class ActorParameterSet(BaseModel):
+    """One actor's entry in a batched parameter response"""
+    index: int = Field(..., description="Number of the actor in the request list (1-based)")
+    name: str = Field(..., description="Exact name of the actor")
+    parameters: List[ActorParameter] = Field(..., description="Parameters for the actor")
+
+
+class ParameterSetBatch(BaseModel):
+    """Structured-output schema: parameters generated for several actors in one call"""
+    actors: List[ActorParameterSet] = Field(..., description="One entry per requested actor")
+
+
+def structured_output_schema(model: type[BaseModel], name: str) -> Dict[str, Any]:
+    """
+    Provider-ready JSON schema for a model, as {"name": ..., "schema": ...}.
+    Every object is closed (additionalProperties: false), which OpenAI's strict mode requires.
+    """
+    schema = model.model_json_schema()
+    for object_schema in [schema, *schema.get("$defs", {}).values()]:
+        if object_schema.get("type") == "object":
+            object_schema["additionalProperties"] = False
+    return {"name": name, "schema": schema}
+
+
 class GenerationMetadata(BaseModel):
     """Metadata for generation runs"""
     timestamp: str = Field(..., description="ISO timestamp of generation")
@@ -181,6 +221,10 @@ __all__ = [
     'SubActorList',
     'EnhancedActor',
     'ActorParameter',
+    'ParameterSet',
+    'ActorParameterSet',
+    'ParameterSetBatch',
+    'structured_output_schema',
     'GenerationMetadata',
     'ParallelizationMetadata',
     'GenerationStats',
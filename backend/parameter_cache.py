@@ -0,0 +1,180 @@
+"""
+Persistent cache for generated actor parameters.
+
+Parameter prompts only differ by the actor's name, type and description, so
+results are reused across runs:
+- Exact match: blake2b digest of everything that goes into the prompt.
+- Semantic match (opt-in, config.parameter_cache_semantic): actors of the same
+  type whose descriptions embed within the similarity threshold reuse each
+  other's parameters, with the actor name swapped in. This hands one actor
+  another actor's parameters, so it is off by default. Needs the optional
+  sentence-transformers and faiss packages; without them only exact matches
+  are served.
+
+Entries live in a sqlite database in the logs directory, shared by all runs.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple
+
+import orjson
+
+from .config import get_config
+from .utils import _base_logs_dir
+
+
+EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+CACHE_FILENAME = "parameter_cache.sqlite"
+
+
+def _load_semantic_backend():
+    """Return (faiss, embedding model) or None if the optional packages are missing"""
+    try:
+        import faiss
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        return None
+    return faiss, SentenceTransformer(EMBEDDING_MODEL_NAME)
+
+
+def retarget_parameters(params: List[Dict[str, Any]], old_name: str, new_name: str) -> List[Dict[str, Any]]:
+    """Swap the actor name parameters were generated for with another actor's name in their text fields"""
+    if not old_name or old_name == new_name:
+        return params
+    return [
+        {field: value.replace(old_name, new_name) if isinstance(value, str) else value
+         for field, value in param.items()}
+        for param in params
+    ]
+
+
+class ParameterCache:
+    """sqlite-backed exact (+ optional semantic) cache for per-actor parameter lists (thread-safe)"""
+
+    def __init__(self, db_path: Path, similarity_threshold: float = 0.92, semantic: bool = False):
+        self.db_path = db_path
+        self.similarity_threshold = similarity_threshold
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS parameters ("
+            " key BLOB PRIMARY KEY, actor_type TEXT, num_params INTEGER, model TEXT,"
+            " name TEXT, description TEXT, params BLOB, embedding BLOB)"
+        )
+        self._conn.commit()
+
+        self._semantic = _load_semantic_backend() if semantic else None
+        # (actor_type, num_params, model) -> (faiss index, [row keys in index order])
+        self._indexes: Dict[Tuple[str, int, str], Tuple[Any, List[bytes]]] = {}
+        if self._semantic:
+            self._load_indexes()
+
+    @staticmethod
+    def _key(actor: Dict[str, Any], num_params: int, model: str) -> bytes:
+        raw = "\x1f".join((
+            str(actor.get('type')), str(actor.get('name')), str(actor.get('description')),
+            str(num_params), model
+        ))
+        return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
+
+    def _embed(self, text: str):
+        _, model = self._semantic
+        return model.encode([text], normalize_embeddings=True).astype("float32")
+
+    def _index_for(self, group: Tuple[str, int, str], dim: int):
+        if group not in self._indexes:
+            faiss, _ = self._semantic
+            self._indexes[group] = (faiss.IndexFlatIP(dim), [])
+        return self._indexes[group]
+
+    def _load_indexes(self) -> None:
+        import numpy as np
+        rows = self._conn.execute(
+            "SELECT key, actor_type, num_params, model, embedding FROM parameters WHERE embedding IS NOT NULL"
+        ).fetchall()
+        for key, actor_type, num_params, model, embedding in rows:
+            vector = np.frombuffer(embedding, dtype="float32").reshape(1, -1)
+            index, keys = self._index_for((actor_type, num_params, model), vector.shape[1])
+            index.add(vector)
+            keys.append(key)
+
+    def get(self, actor: Dict[str, Any], num_params: int, model: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached parameters for this actor, or None on a miss"""
+        key = self._key(actor, num_params, model)
+        group = (str(actor.get('type')), num_params, model)
+        with self._lock:
+            row = self._conn.execute("SELECT params FROM parameters WHERE key = ?", (key,)).fetchone()
+            if row:
+                return orjson.loads(row[0])
+            if not self._semantic or group not in self._indexes:
+                return None
+
+        # Embedding is the slow part - keep it outside the lock
+        vector = self._embed(str(actor.get('description')))
+        with self._lock:
+            index, keys = self._indexes[group]
+            scores, positions = index.search(vector, 1)
+            if positions[0][0] < 0 or scores[0][0] < self.similarity_threshold:
+                return None
+            name, params = self._conn.execute(
+                "SELECT name, params FROM parameters WHERE key = ?", (keys[positions[0][0]],)
+            ).fetchone()
+
+        return retarget_parameters(orjson.loads(params), name, str(actor.get('name')))
+
+    def put(self, actor: Dict[str, Any], num_params: int, model: str, params: List[Dict[str, Any]]) -> None:
+        """Store freshly generated parameters (empty results are not cached)"""
+        if not params:
+            return
+
+        key = self._key(actor, num_params, model)
+        vector = self._embed(str(actor.get('description'))) if self._semantic else None
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO parameters VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, str(actor.get('type')), num_params, model, str(actor.get('name')),
+                 str(actor.get('description')), orjson.dumps(params),
+                 vector.tobytes() if vector is not None else None)
+            )
+            self._conn.commit()
+            if vector is not None and cursor.rowcount:
+                index, keys = self._index_for((str(actor.get('type')), num_params, model), vector.shape[1])
+                index.add(vector)
+                keys.append(key)
+
+
+_parameter_cache: Optional[ParameterCache] = None
+# get_parameter_cache runs on worker threads - only one of them may build the cache
+_parameter_cache_lock = threading.Lock()
+
+
+def get_parameter_cache() -> Optional[ParameterCache]:
+    """
+    Get the shared parameter cache, or None when it's disabled in the config.
+    The first call is slow (sqlite, embedding model, faiss index) - call it via asyncio.to_thread from async code.
+    """
+    global _parameter_cache
+    config = get_config()
+    if not config.parameter_cache_enabled:
+        return None
+
+    with _parameter_cache_lock:
+        if _parameter_cache is None:
+            base_logs_dir = _base_logs_dir(config.base_logs_dir)
+            base_logs_dir.mkdir(parents=True, exist_ok=True)
+            _parameter_cache = ParameterCache(
+                base_logs_dir / CACHE_FILENAME,
+                similarity_threshold=config.parameter_cache_similarity,
+                semantic=config.parameter_cache_semantic
+            )
+    return _parameter_cache
+
+
+__all__ = [
+    'ParameterCache',
+    'get_parameter_cache',
+    'retarget_parameters'
+]
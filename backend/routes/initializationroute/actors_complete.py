@@ -41,28 +41,23 @@ if __name__ == "__main__":
 
 from worldmodel.backend.llm.llm import call_llm_api, get_cost_session, reset_cost_session, print_cost_summary
 from worldmodel.backend.routes.initializationroute.prompts import generate_initial_actor_prompts, generate_leveldown_prompts
-
-# Global semaphore for controlling concurrent requests
-SEMAPHORE = asyncio.Semaphore(5)
+from worldmodel.backend.utils import call_llm_api_async as _gated_llm_call
 
 # ==================== ASYNC WRAPPER FOR LLM API ====================
 
 async def call_llm_api_async(prompt: str, model_provider: str, model_name: str, 
-                            max_tokens: int = 4096, temperature: float = 0.2) -> str:
-    """Async wrapper for the LLM API call"""
-    async with SEMAPHORE:
-        # Run the synchronous LLM API call in a thread pool
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            lambda: call_llm_api(
-                prompt=prompt,
-                model_provider=model_provider,
-                model_name=model_name,
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
-        )
+                            max_tokens: int = 4096, temperature: float = 0.2,
+                            system: Optional[str] = None) -> str:
+    """Async wrapper for the LLM API call, bounded by the shared limits in config.llm"""
+    return await _gated_llm_call(
+        call_llm_api,
+        prompt=prompt,
+        model_provider=model_provider,
+        model_name=model_name,
+        system=system,
+        max_tokens=max_tokens,
+        temperature=temperature
+    )
 
 # ==================== LOGGING FUNCTIONS ====================
 
@@ -217,7 +212,6 @@ def generate_level_0_actors(model_provider: str, model_name: str, num_actors: in
     
     # Generate prompts using the centralized prompts module
     system_context, user_context = generate_initial_actor_prompts(num_actors)
-    full_prompt = system_context + user_context
 
     try:
         print(f"🔄 Using {model_provider} with model: {model_name}")
@@ -225,7 +219,8 @@ def generate_level_0_actors(model_provider: str, model_name: str, num_actors: in
         
         # Call the abstracted LLM API
         response = call_llm_api(
-            prompt=full_prompt,
+            prompt=user_context,
+            system=system_context,
             model_provider=model_provider,
             model_name=model_name,
             max_tokens=4096,
@@ -238,6 +233,8 @@ def generate_level_0_actors(model_provider: str, model_name: str, num_actors: in
             # Add depth=1 to all top-level actors
             for actor in raw_data.get("actors", []):
                 actor["depth"] = 1
+            # total_count is not requested from the model - derive it
+            raw_data["total_count"] = len(raw_data.get("actors", []))
             actors_list = ActorList(**raw_data)
 
             # Pretty print the validated data
@@ -348,14 +345,13 @@ async def generate_subactors_for_actor_async(actor_data: Dict[str, Any], model_p
         actor_name, actor_description, actor_type, num_subactors, current_level
     )
     
-    full_prompt = system_context + user_context
-    
     try:
         print(f"🔄 [{actor_index+1}] Generating sub-actors for: {actor_name}")
         
         # Call the async LLM API
         response = await call_llm_api_async(
-            prompt=full_prompt,
+            prompt=user_context,
+            system=system_context,
             model_provider=model_provider,
             model_name=model_name,
             max_tokens=3000,
@@ -368,6 +364,8 @@ async def generate_subactors_for_actor_async(actor_data: Dict[str, Any], model_p
             # Inject depth before validation
             for sa in raw_data.get("sub_actors", []):
                 sa.setdefault("depth", current_level + 1)
+            # total_count is not requested from the model - derive it
+            raw_data["total_count"] = len(raw_data.get("sub_actors", []))
             sub_actors_list = SubActorList(**raw_data)
             
             print(f"✅ [{actor_index+1}] Generated {sub_actors_list.total_count} sub-actors for {actor_name}")
@@ -414,14 +412,13 @@ def generate_subactors_for_actor(actor_data: Dict[str, Any], model_provider: str
         actor_name, actor_description, actor_type, num_subactors, current_level
     )
     
-    full_prompt = system_context + user_context
-    
     try:
         print(f"🔄 Generating sub-actors for: {actor_name}")
         
         # Call the LLM API
         response = call_llm_api(
-            prompt=full_prompt,
+            prompt=user_context,
+            system=system_context,
             model_provider=model_provider,
             model_name=model_name,
             max_tokens=3000,
@@ -433,6 +430,8 @@ def generate_subactors_for_actor(actor_data: Dict[str, Any], model_provider: str
             raw_data = json.loads(response)
             for sa in raw_data.get("sub_actors", []):
                 sa.setdefault("depth", current_level + 1)
+            # total_count is not requested from the model - derive it
+            raw_data["total_count"] = len(raw_data.get("sub_actors", []))
             sub_actors_list = SubActorList(**raw_data)
             
             print(f"✅ Generated {sub_actors_list.total_count} sub-actors for {actor_name}")
@@ -884,7 +883,8 @@ async def generate_complete_world_model_async(model_provider: str = "anthropic",
         log_info("Starting Level 0 generation", 
                 f"Generating {num_actors} initial world actors")
         
-        level_0_actors = generate_level_0_actors(model_provider, model_name, num_actors, run_folder)
+        # Level 0 is a single blocking call - run it off the event loop, through the same limits
+        level_0_actors = await _gated_llm_call(generate_level_0_actors, model_provider, model_name, num_actors, run_folder)
         
         if not level_0_actors:
             log_error(
@@ -217,9 +217,6 @@ def get_worldmodel_actors_via_llm(model_provider="anthropic", model_name="claude
     
     # Generate prompts using the centralized prompts module
     system_context, user_context = generate_initial_actor_prompts(num_actors)
-    
-    # Combine system and user contexts into a single prompt
-    full_prompt = system_context + user_context
 
     try:
         # Reset cost session at the start of a new run
@@ -231,7 +228,8 @@ def get_worldmodel_actors_via_llm(model_provider="anthropic", model_name="claude
         
         # Call the abstracted LLM API
         response = call_llm_api(
-            prompt=full_prompt,
+            prompt=user_context,
+            system=system_context,
             model_provider=model_provider,
             model_name=model_name,
             max_tokens=4096,  # Increased significantly for 50 actors with descriptions
@@ -241,6 +239,8 @@ def get_worldmodel_actors_via_llm(model_provider="anthropic", model_name="claude
         # Try to parse the JSON and validate with Pydantic
         try:
             raw_data = json.loads(response)
+            # total_count is not requested from the model - derive it
+            raw_data["total_count"] = len(raw_data.get("actors", []))
             actors_list = ActorList(**raw_data)
             
             # Pretty print the validated data with success logging
@@ -2,10 +2,14 @@ import json
 import sys
 import os
 import traceback
+import asyncio
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from pathlib import Path
-from pydantic import BaseModel, Field
+
+import aiofiles
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
 
 # Add the parent directory to Python path for direct execution
 if __name__ == "__main__":
@@ -15,11 +19,13 @@ if __name__ == "__main__":
     parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(script_dir))))
     sys.path.insert(0, parent_dir)
 
+from worldmodel.backend.config import get_config
 from worldmodel.backend.llm.llm import call_llm_api
 from worldmodel.backend.llm.llm import get_cost_session
 from worldmodel.backend.llm.llm import reset_cost_session
 from worldmodel.backend.llm.llm import print_cost_summary
 from worldmodel.backend.routes.initializationroute.prompts import generate_leveldown_prompts
+from worldmodel.backend.utils import call_llm_api_async, parse_llm_actor_list, save_level_data_async
 
 def log_error(error_type, error_message, details=None, exception=None):
     """
@@ -49,8 +55,14 @@ def log_error(error_type, error_message, details=None, exception=None):
     
     print(f"{'='*60}\n")
 
+# Actor-tree models are built in large numbers and never mutated after validation:
+# freeze them and build the schema once at import time
+_TREE_MODEL_CONFIG = ConfigDict(extra='ignore', revalidate_instances='never', defer_build=False, frozen=True)
+
 class SubActor(BaseModel):
     """Represents a sub-actor within a main actor"""
+    model_config = _TREE_MODEL_CONFIG
+
     name: str = Field(..., description="The name of the sub-actor")
     description: str = Field(..., description="A detailed description of the sub-actor's role and influence")
     type: str = Field(..., description="The type of sub-actor (e.g., administration, company, movement, individual)")
@@ -60,12 +72,16 @@ class SubActor(BaseModel):
 
 class SubActorList(BaseModel):
     """Container for a list of sub-actors for a specific parent actor"""
+    model_config = _TREE_MODEL_CONFIG
+
     sub_actors: List[SubActor] = Field(..., description="List of sub-actors within the parent actor")
     total_count: int = Field(..., description="Total number of sub-actors in the list")
     parent_actor: str = Field(..., description="The parent actor these sub-actors belong to")
 
 class EnhancedActor(BaseModel):
     """Enhanced actor model that includes sub-actors"""
+    model_config = _TREE_MODEL_CONFIG
+
     name: str = Field(..., description="The name of the actor")
     description: str = Field(..., description="A short description of the actor's role and influence")
     type: str = Field(..., description="The type of actor")
@@ -147,14 +163,13 @@ def generate_subactors_for_actor(actor_data: Dict[str, Any], model_provider: str
         actor_name, actor_description, actor_type, num_subactors, current_level
     )
     
-    full_prompt = system_context + user_context
-    
     try:
         print(f"🔄 Generating sub-actors for: {actor_name}")
         
         # Call the LLM API
         response = call_llm_api(
-            prompt=full_prompt,
+            prompt=user_context,
+            system=system_context,
             model_provider=model_provider,
             model_name=model_name,
             max_tokens=3000,
@@ -163,7 +178,13 @@ def generate_subactors_for_actor(actor_data: Dict[str, Any], model_provider: str
         
         # Parse and validate the response
         try:
-            raw_data = json.loads(response)
+            raw_data = parse_llm_actor_list(
+                response, "sub_actors", f"Sub-actor generation for {actor_name}",
+                required_fields=('name', 'description', 'type', 'parent_actor'),
+                parent_actor=actor_name
+            )
+            # total_count is not requested from the model - derive it
+            raw_data["total_count"] = len(raw_data.get("sub_actors", []))
             sub_actors_list = SubActorList(**raw_data)
             
             print(f"✅ Generated {sub_actors_list.total_count} sub-actors for {actor_name}")
@@ -200,34 +221,44 @@ def generate_subactors_for_actor(actor_data: Dict[str, Any], model_provider: str
         )
         raise
 
-def save_enhanced_actors_to_json(enhanced_actors: List[EnhancedActor], original_metadata: Dict[str, Any], 
-                                model_provider: str, model_name: str, total_subactors: int, level: int = 1):
+async def _read_json_async(filepath: Path) -> Dict[str, Any]:
+    """Read and parse a JSON file without blocking the event loop"""
+    async with aiofiles.open(filepath, "rb") as f:
+        return orjson.loads(await f.read())
+
+def _get_latest_run_folder() -> Path:
+    """Return the most recently created run folder in init_logs"""
+    script_dir = Path(__file__).parent
+    backend_dir = script_dir.parent.parent  # Go up to worldmodel/backend
+    init_logs_dir = backend_dir / "init_logs"
+    
+    run_folders = [d for d in init_logs_dir.iterdir() if d.is_dir() and d.name.startswith("run_")]
+    
+    if not run_folders:
+        raise FileNotFoundError(f"No run folders found in: {init_logs_dir}")
+    
+    # Sort folders by creation time (most recent first)
+    run_folders.sort(key=lambda x: x.stat().st_ctime, reverse=True)
+    return run_folders[0]
+
+async def save_enhanced_actors_to_json(enhanced_actors: List[Dict[str, Any]], original_metadata: Dict[str, Any], 
+                                model_provider: str, model_name: str, total_subactors: int, level: int = 1,
+                                run_folder: Optional[Path] = None):
     """
     Save the enhanced actors with sub-actors to a new JSON file in the same run folder as the source data
     
     Args:
-        enhanced_actors (List[EnhancedActor]): List of actors with their sub-actors
+        enhanced_actors (List[Dict[str, Any]]): List of actor dicts with their nested sub-actors
         original_metadata (Dict[str, Any]): Original metadata from round 0
         model_provider (str): LLM provider used
         model_name (str): Model name used
         total_subactors (int): Total number of sub-actors generated
         level (int): Level number for the output file (default: 1)
+        run_folder (Path, optional): Target run folder (default: most recent run folder)
     """
     try:
-        # Get the path to the init_logs directory
-        script_dir = Path(__file__).parent
-        backend_dir = script_dir.parent.parent  # Go up to worldmodel/backend
-        init_logs_dir = backend_dir / "init_logs"
-        
         # Find the most recent run folder (same as used in load_features_round_0)
-        run_folders = [d for d in init_logs_dir.iterdir() if d.is_dir() and d.name.startswith("run_")]
-        
-        if not run_folders:
-            raise FileNotFoundError(f"No run folders found in: {init_logs_dir}")
-        
-        # Sort folders by creation time (most recent first)
-        run_folders.sort(key=lambda x: x.stat().st_ctime, reverse=True)
-        most_recent_folder = run_folders[0]
+        most_recent_folder = run_folder or _get_latest_run_folder()
         
         # Create the filename for the specified level in the same run folder
         filename = f"Features_level_{level}.json"
@@ -235,7 +266,7 @@ def save_enhanced_actors_to_json(enhanced_actors: List[EnhancedActor], original_
         
         # Calculate statistics
         total_main_actors = len(enhanced_actors)
-        actors_with_subactors = sum(1 for actor in enhanced_actors if actor.sub_actors_count > 0)
+        actors_with_subactors = sum(1 for actor in enhanced_actors if actor.get("sub_actors_count", 0) > 0)
         avg_subactors_per_actor = total_subactors / total_main_actors if total_main_actors > 0 else 0
         
         # Get current cost session data
@@ -260,19 +291,14 @@ def save_enhanced_actors_to_json(enhanced_actors: List[EnhancedActor], original_
                 },
                 "cost_tracking": cost_data
             },
-            "actors": [actor.model_dump() for actor in enhanced_actors],
+            "actors": enhanced_actors,
             "total_main_actors": total_main_actors,
             "total_subactors": total_subactors,
             "level": level
         }
         
-        # Save to JSON file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
-        
-        print(f"💾 Enhanced JSON saved successfully: {filepath}")
-        print(f"📁 Run folder: {most_recent_folder.name}")
-        return str(filepath)
+        # Save to JSON file (atomic, logs its own errors)
+        return await save_level_data_async(output_data, level, most_recent_folder)
         
     except Exception as e:
         log_error(
@@ -283,11 +309,46 @@ def save_enhanced_actors_to_json(enhanced_actors: List[EnhancedActor], original_
         )
         return None
 
+def _collect_actors_at_depth(actors: List[Dict[str, Any]], depth: int) -> List[Dict[str, Any]]:
+    """Return the actors at *depth* (0 = main actors) that have no sub-actors yet"""
+    nodes = actors
+    for _ in range(depth):
+        nodes = [sub for node in nodes for sub in node.get("sub_actors", [])]
+    return [node for node in nodes if not node.get("sub_actors")]
+
+def _snapshot_to_depth(actors: List[Dict[str, Any]], max_depth: int, depth: int = 0) -> List[Dict[str, Any]]:
+    """Copy the actor tree down to *max_depth*, leaving actors at that depth without sub-actors"""
+    if depth == max_depth:
+        return [{**actor, "sub_actors": [], "sub_actors_count": 0} for actor in actors]
+    return [
+        {**actor, "sub_actors": _snapshot_to_depth(actor.get("sub_actors", []), max_depth, depth + 1)}
+        for actor in actors
+    ]
+
 def generate_actor_leveldown(model_provider: str = "anthropic", 
                              model_name: str = "claude-3-5-sonnet-latest", 
                              num_subactors_per_actor: int = 8, 
                              skip_on_error: bool = True,
-                             target_level: int = 1):
+                             target_level: int = 1,
+                             max_concurrent_requests: Optional[int] = None):
+    """
+    Synchronous wrapper for generate_actor_leveldown_async
+    """
+    return asyncio.run(generate_actor_leveldown_async(
+        model_provider=model_provider,
+        model_name=model_name,
+        num_subactors_per_actor=num_subactors_per_actor,
+        skip_on_error=skip_on_error,
+        target_level=target_level,
+        max_concurrent_requests=max_concurrent_requests
+    ))
+
+async def generate_actor_leveldown_async(model_provider: str = "anthropic", 
+                                         model_name: str = "claude-3-5-sonnet-latest", 
+                                         num_subactors_per_actor: int = 8, 
+                                         skip_on_error: bool = True,
+                                         target_level: int = 1,
+                                         max_concurrent_requests: Optional[int] = None):
     """
     Generate sub-actors down to *target_level* depth for the latest run folder.
 
@@ -295,6 +356,13 @@ def generate_actor_leveldown(model_provider: str = "anthropic",
     intermediate levels are generated automatically.  The routine aborts early if
     a requested level is impossible because parent actors have no sub-actors.
 
+    Generation is pipelined: each actor expansion is a task, and a parent's new
+    sub-actors are queued for the next level as soon as they arrive instead of
+    waiting for the whole level to finish.  At most *max_concurrent_requests* LLM
+    calls run at once, within the process-wide limits of call_llm_api_async.
+    Each level file is written in a background task as soon as that level is
+    complete.
+
     Args:
         model_provider: LLM provider to use ("anthropic" or "openai", …).
         model_name: Concrete model name.
@@ -304,6 +372,8 @@ def generate_actor_leveldown(model_provider: str = "anthropic",
             run.
         target_level: Depth level to generate (1 = first sub-actor layer,
             2 = sub-sub-actors, …).
+        max_concurrent_requests: Maximum number of LLM calls in flight
+            (defaults to config.llm.max_concurrent_requests).
     Returns:
         Path to the last generated level JSON or None if nothing was done.
     """
@@ -320,31 +390,22 @@ def generate_actor_leveldown(model_provider: str = "anthropic",
     reset_cost_session()
     
     # Determine most recent run folder and deepest existing level
-    script_dir = Path(__file__).parent
-    backend_dir = script_dir.parent.parent
-    init_logs_dir = backend_dir / "init_logs"
-    run_folders = [d for d in init_logs_dir.iterdir() if d.is_dir() and d.name.startswith("run_")]
-    if not run_folders:
+    try:
+        run_folder = _get_latest_run_folder()
+    except FileNotFoundError:
         print("❌ No run folders found – please execute level 0 generation first.")
         return None
 
-    run_folders.sort(key=lambda x: x.stat().st_ctime, reverse=True)
-    run_folder = run_folders[0]
-
     # Helper to load a level JSON
-    def _load_level(level:int):
+    async def _load_level(level:int):
         fp = run_folder / f"Features_level_{level}.json"
         if not fp.exists():
             return None, fp
-        with open(fp, "r", encoding="utf-8") as f:
-            return json.load(f), fp
+        return await _read_json_async(fp), fp
 
     # Discover deepest existing file
     deepest_existing = 0
-    while True:
-        data,_ = _load_level(deepest_existing)
-        if data is None:
-            break
+    while (run_folder / f"Features_level_{deepest_existing}.json").exists():
         deepest_existing += 1
     deepest_existing -= 1  # step back to last existing
 
@@ -356,128 +417,139 @@ def generate_actor_leveldown(model_provider: str = "anthropic",
         print("❌ Level 0 data not found – run initialization first.")
         return None
 
-    current_level = deepest_existing
+    first_level = deepest_existing + 1
 
-    while current_level < target_level:
-        parent_data, parent_fp = _load_level(current_level)
-        if parent_data is None:
-            print(f"❌ Cannot generate level {current_level+1} because parent level file is missing.")
-            break
+    parent_data, parent_fp = await _load_level(deepest_existing)
+    if parent_data is None:
+        print(f"❌ Cannot generate level {first_level} because parent level file is missing.")
+        return None
 
-        parent_actors = parent_data.get("actors", [])
+    # Load original_metadata only once (from level 0, or inherited by deeper files)
+    if deepest_existing == 0:
+        original_metadata = parent_data.get("metadata", {})
+    else:
+        original_metadata = parent_data.get("metadata", {}).get("original_metadata", parent_data.get("metadata", {}))
+
+    parent_actors = parent_data.get("actors", [])
+
+    # Actors at the deepest existing level that have no sub-actors yet
+    expandable = _collect_actors_at_depth(parent_actors, deepest_existing)
+    if not expandable:
+        print(f"⚠️  No expandable actors found in level {deepest_existing}. Stopping generation.")
+        return run_folder / f"Features_level_{deepest_existing}.json"
+
+    print(f"\n{'='*60}\n🔽 Generating levels {first_level}-{target_level} from parent file {parent_fp.name}\n{'='*60}")
+
+    # Every actor expansion is its own task sharing one bounded pool of LLM slots.
+    # As soon as a parent's sub-actors arrive, their own expansions are queued, so
+    # level N+1 work overlaps with the tail of level N.  A level is complete once
+    # the previous level is complete and none of its own tasks are outstanding.
+    if max_concurrent_requests is None:
+        max_concurrent_requests = get_config().llm.max_concurrent_requests
+    semaphore = asyncio.Semaphore(max_concurrent_requests)
+    levels = range(first_level, target_level + 1)
+    level_done = {level: asyncio.Event() for level in levels}
+    level_pending = {level: 0 for level in levels}
+    level_stats = {level: {"scheduled": 0, "successful": 0, "failed": 0, "shared": 0, "total_subactors": 0} for level in levels}
+    generations: Dict[tuple, asyncio.Future] = {}
+    tasks = []
+    errors = []
+
+    def _finish_level_if_drained(level: int):
+        while level <= target_level and not level_done[level].is_set():
+            previous_done = level == first_level or level_done[level - 1].is_set()
+            if not previous_done or level_pending[level]:
+                return
+            level_done[level].set()
+            level += 1
+
+    def _schedule(actor_data: Dict[str, Any], level: int):
+        level_pending[level] += 1
+        level_stats[level]["scheduled"] += 1
+        tasks.append(asyncio.create_task(_expand(actor_data, level)))
+
+    async def _generate_once(actor_data: Dict[str, Any], level: int) -> SubActorList:
+        # The per-run cap, then the process-wide LLM limits in call_llm_api_async
+        async with semaphore:
+            return await call_llm_api_async(
+                generate_subactors_for_actor,
+                actor_data, model_provider, model_name, num_subactors_per_actor, level
+            )
 
-        # For level 0->1: expand main actors without sub-actors
-        # For level 1->2: expand sub-actors from level 1
-        # For level 2->3: expand sub-actors from level 2, etc.
-        if current_level == 0:
-            # Level 0->1: expand main actors without sub-actors
-            expandable = [a for a in parent_actors if not a.get("sub_actors")]
-        else:
-            # Level 1->2, 2->3, etc.: expand sub-actors from previous level
-            expandable = []
-            for actor in parent_actors:
-                if actor.get("sub_actors"):
-                    expandable.extend(actor["sub_actors"])
-                    
-        if not expandable:
-            print(f"⚠️  No expandable actors found in level {current_level}. Stopping generation.")
+    async def _expand(actor_data: Dict[str, Any], level: int):
+        stats = level_stats[level]
+        try:
+            if errors:
+                # A non-skippable failure happened elsewhere – don't start new calls
+                return
+            # Identical actors (same level, type, name and description) share one LLM call;
+            # every occurrence gets its own copy of the sub-actors via model_dump
+            key = (level, actor_data.get("type"), actor_data.get("name"), actor_data.get("description"))
+            generation = generations.get(key)
+            if generation is None:
+                generation = generations[key] = asyncio.ensure_future(_generate_once(actor_data, level))
+            else:
+                stats["shared"] += 1
+            sub_list = await generation
+            actor_data["sub_actors"] = [sa.model_dump() for sa in sub_list.sub_actors]
+            actor_data["sub_actors_count"] = sub_list.total_count
+            stats["total_subactors"] += sub_list.total_count
+            stats["successful"] += 1
+
+            if level < target_level:
+                for sub_actor in actor_data["sub_actors"]:
+                    _schedule(sub_actor, level + 1)
+        except Exception as e:
+            stats["failed"] += 1
+            actor_data.setdefault("sub_actors", [])
+            actor_data.setdefault("sub_actors_count", 0)
+            if not skip_on_error:
+                errors.append(e)
+        finally:
+            level_pending[level] -= 1
+            _finish_level_if_drained(level)
+
+    for actor_data in expandable:
+        _schedule(actor_data, first_level)
+
+    pending_saves = []
+    last_level = deepest_existing
+
+    for level in levels:
+        await level_done[level].wait()
+        if errors:
             break
 
-        print(f"\n{'='*60}\n🔽 Generating level {current_level+1} from parent file {parent_fp.name}\n{'='*60}")
+        stats = level_stats[level]
+        if not stats["scheduled"]:
+            print(f"⚠️  No expandable actors found in level {level - 1}. Stopping generation.")
+            break
 
-        # Re-use existing generation code for one layer
-        # Load original_metadata only once (from level 0)
-        if current_level == 0:
-            original_metadata = parent_data.get("metadata", {})
-        else:
-            # For level 1+, try to get original_metadata from the parent data
-            original_metadata = parent_data.get("metadata", {}).get("original_metadata", parent_data.get("metadata", {}))
-
-        # Process expandable actors (main actors for level 0->1, sub-actors for level 1->2+)
-        total_subactors = 0
-        enhanced_actors = []
-        successful_actors = failed_actors = 0
-
-        if current_level == 0:
-            # Level 0->1: Process main actors
-            for actor_data in parent_actors:
-                actor_name = actor_data["name"]
-                if actor_data.get("sub_actors"):
-                    # Already has sub-actors – keep them
-                    enhanced_actors.append(EnhancedActor(**actor_data))
-                    continue
-
-                try:
-                    sub_list = generate_subactors_for_actor(actor_data, model_provider, model_name, num_subactors_per_actor, current_level + 1)
-                    enhanced_actors.append(EnhancedActor(
-                        name=actor_data["name"],
-                        description=actor_data["description"],
-                        type=actor_data["type"],
-                        sub_actors=sub_list.sub_actors,
-                        sub_actors_count=sub_list.total_count,
-                    ))
-                    total_subactors += sub_list.total_count
-                    successful_actors += 1
-                except Exception as e:
-                    failed_actors += 1
-                    if skip_on_error:
-                        enhanced_actors.append(EnhancedActor(**actor_data))
-                    else:
-                        raise
-        else:
-            # Level 1->2+: Process sub-actors from previous level
-            for main_actor in parent_actors:
-                updated_sub_actors = []
-                for sub_actor in main_actor.get("sub_actors", []):
-                    if sub_actor.get("sub_actors"):
-                        # Sub-actor already has sub-actors – keep them
-                        updated_sub_actors.append(SubActor(**sub_actor))
-                        continue
-                    
-                    try:
-                        sub_list = generate_subactors_for_actor(sub_actor, model_provider, model_name, num_subactors_per_actor, current_level + 1)
-                        updated_sub_actor = SubActor(
-                            name=sub_actor["name"],
-                            description=sub_actor["description"],
-                            type=sub_actor["type"],
-                            parent_actor=sub_actor["parent_actor"],
-                            sub_actors=sub_list.sub_actors,
-                            sub_actors_count=sub_list.total_count
-                        )
-                        updated_sub_actors.append(updated_sub_actor)
-                        total_subactors += sub_list.total_count
-                        successful_actors += 1
-                    except Exception as e:
-                        failed_actors += 1
-                        if skip_on_error:
-                            updated_sub_actors.append(SubActor(**sub_actor))
-                        else:
-                            raise
-                
-                # Create enhanced main actor with updated sub-actors
-                enhanced_actors.append(EnhancedActor(
-                    name=main_actor["name"],
-                    description=main_actor["description"],
-                    type=main_actor["type"],
-                    sub_actors=updated_sub_actors,
-                    sub_actors_count=len(updated_sub_actors)
-                ))
-
-        # Save the current level file using existing helper
-        save_enhanced_actors_to_json(
-            enhanced_actors,
+        print(f"\n✅ Level {level} complete: {stats['successful']} actors expanded, {stats['failed']} failed, "
+              f"{stats['shared']} served from duplicate requests")
+
+        # Snapshot the tree down to this level now – deeper levels keep growing in place
+        pending_saves.append(asyncio.create_task(save_enhanced_actors_to_json(
+            _snapshot_to_depth(parent_actors, level),
             original_metadata,
             model_provider,
             model_name,
-            total_subactors,
-            current_level + 1,
-        )
+            stats["total_subactors"],
+            level,
+            run_folder,
+        )))
 
         print_cost_summary()
+        last_level = level
+
+    await asyncio.gather(*tasks)
+    # Make sure every level file is on disk before reporting back
+    await asyncio.gather(*pending_saves)
 
-        current_level += 1
+    if errors:
+        raise errors[0]
 
-    return run_folder / f"Features_level_{current_level}.json"
+    return run_folder / f"Features_level_{last_level}.json"
 
 # Allow direct execution of the script
 if __name__ == "__main__":
@@ -1,25 +1,65 @@
 import sys
 import os
-import json
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from tqdm import tqdm
+import orjson
 
 # Add the parent of 'worldmodel' to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../..")))
-from worldmodel.backend.llm.llm import call_llm_api
+from worldmodel.backend.llm.llm import call_llm_api, max_output_tokens, supports_structured_output
+from worldmodel.backend.utils import parse_llm_json
+from worldmodel.backend.models import ParameterSet, ParameterSetBatch, structured_output_schema
+
+# Responses are pinned to these schemas where the model supports structured output
+PARAMETER_SET_SCHEMA = structured_output_schema(ParameterSet, "parameter_set")
+PARAMETER_SET_BATCH_SCHEMA = structured_output_schema(ParameterSetBatch, "parameter_set_batch")
+
+# Other models get the same shape spelled out in the prompt instead
+_PARAMETER_EXAMPLE = '{"code_name": "example_param", "name": "Example Parameter", "description": "A short description.", "type": "float", "expected_value": "0.0 - 1.0"}'
+PARAMETER_SET_FORMAT = f"""Return only a JSON object in this format:
+{{"parameters": [{_PARAMETER_EXAMPLE}, ...]}}"""
+PARAMETER_SET_BATCH_FORMAT = f"""Return only a JSON object in this format:
+{{"actors": [{{"index": 1, "name": "Actor Name", "parameters": [{_PARAMETER_EXAMPLE}, ...]}}, ...]}}"""
+
+# Output token budget per actor, for single and batched parameter generations
+PARAMETER_TOKENS_PER_ACTOR = 2000
+
+def parameter_batch_size(model_provider: str, model_name: str, max_batch_size: int) -> int:
+    """Most actors (up to max_batch_size) whose parameters fit in one response of this model"""
+    return max(1, min(max_batch_size, max_output_tokens(model_provider, model_name) // PARAMETER_TOKENS_PER_ACTOR))
 
 def count_actors_recursively(actor: Dict[str, Any]) -> int:
     """
     Count the total number of actors including this one and all sub-actors recursively.
+    Iterative, so deep trees don't pay for (or overflow) Python call frames.
     """
-    count = 1  # Count this actor
-    if 'sub_actors' in actor and isinstance(actor['sub_actors'], list):
-        for sub in actor['sub_actors']:
-            count += count_actors_recursively(sub)
+    count = 0
+    stack = [actor]
+    while stack:
+        current = stack.pop()
+        count += 1
+        sub_actors = current.get('sub_actors')
+        if isinstance(sub_actors, list):
+            stack.extend(sub_actors)
     return count
 
+def collect_actors_recursively(actor: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Return this actor and all of its sub-actors as a flat list (depth-first, parents before children).
+    """
+    actors = []
+    stack = [actor]
+    while stack:
+        current = stack.pop()
+        actors.append(current)
+        sub_actors = current.get('sub_actors')
+        if isinstance(sub_actors, list):
+            # Reversed so children are visited in their original order
+            stack.extend(reversed(sub_actors))
+    return actors
+
 def find_latest_deepest_json(init_logs_dir: Path) -> Path:
     """Return the **deepest** Features_level_N.json (highest N) in the most recent run folder."""
     run_folders = [d for d in init_logs_dir.iterdir() if d.is_dir() and d.name.startswith("run_")]
@@ -39,6 +79,7 @@ def generate_parameters_for_actor(actor: Dict[str, Any], num_params: int, model_
     """
     Call LLM to generate a list of parameters for the given actor dict.
     """
+    structured = supports_structured_output(model_provider, model_name)
     prompt = f"""
 You are an expert in world modeling and data schema design. For the following actor, generate a list of {num_params} important and relevant parameters that would be most useful for simulation, analytics, or AI reasoning.
 - Carefully select the parameters that are most significant for this specific actor, based on its type, name, and description.
@@ -53,21 +94,22 @@ Actor type: {actor.get('type')}
 Actor name: {actor.get('name')}
 Actor description: {actor.get('description')}
 
-Return a JSON array of exactly {num_params} objects with these fields. Example format:
-[
-  {{"code_name": "example_param", "name": "Example Parameter", "description": "A short description.", "type": "float", "expected_value": "0.0 - 1.0"}},
-  ...
-]
+Return exactly {num_params} parameters.
+{'' if structured else PARAMETER_SET_FORMAT}
 """
     response = call_llm_api(
         prompt=prompt,
         model_provider=model_provider,
         model_name=model_name,
-        max_tokens=2000,
+        json_schema=PARAMETER_SET_SCHEMA if structured else None,
+        max_tokens=PARAMETER_TOKENS_PER_ACTOR,
         temperature=0.3
     )
     try:
-        params = json.loads(response)
+        # A response cut off at max_tokens (or free-form, without a schema) can still fail to parse
+        params = parse_llm_json(response, f"Parameters for {actor.get('name')}")
+        if isinstance(params, dict):
+            params = params.get("parameters")
         if isinstance(params, list):
             return params[:num_params]  # Only keep the requested number
         else:
@@ -77,6 +119,64 @@ Return a JSON array of exactly {num_params} objects with these fields. Example f
         print("Raw LLM output:", response)
         return []
 
+def generate_parameters_for_actor_batch(actors: List[Dict[str, Any]], num_params: int, model_provider: str, model_name: str) -> Optional[Dict[int, List[Dict[str, Any]]]]:
+    """
+    Call LLM once to generate parameters for several actors, returned as {position in actors: parameters}.
+    Entries are matched by their index rather than by name, since actor names aren't unique.
+    Returns None if the call fails or the response can't be parsed, so the caller can fall
+    back to per-actor calls. Size batches with parameter_batch_size so the response fits.
+    """
+    structured = supports_structured_output(model_provider, model_name)
+    actor_lines = "\n".join(
+        f"[{number}] Actor name: {actor.get('name')} | Actor type: {actor.get('type')} | Actor description: {actor.get('description')}"
+        for number, actor in enumerate(actors, start=1)
+    )
+    prompt = f"""
+You are an expert in world modeling and data schema design. For each of the following {len(actors)} actors, generate a list of {num_params} important and relevant parameters that would be most useful for simulation, analytics, or AI reasoning.
+- Carefully select the parameters that are most significant for each specific actor, based on its type, name, and description.
+- For each parameter, provide:
+  - code_name (short, snake_case, suitable for coding)
+  - name (human-readable)
+  - description (1-2 sentences)
+  - type (string, integer, float, boolean, document, etc.)
+  - expected_value (example value or range)
+
+Actors:
+{actor_lines}
+
+Return one entry per actor, with the actor's number as index and its exact name, each with exactly {num_params} parameters.
+{'' if structured else PARAMETER_SET_BATCH_FORMAT}
+"""
+    response = None
+    try:
+        response = call_llm_api(
+            prompt=prompt,
+            model_provider=model_provider,
+            model_name=model_name,
+            json_schema=PARAMETER_SET_BATCH_SCHEMA if structured else None,
+            max_tokens=min(
+                PARAMETER_TOKENS_PER_ACTOR * len(actors), max_output_tokens(model_provider, model_name)
+            ),
+            temperature=0.3
+        )
+        entries = parse_llm_json(response, f"Batched parameters for {len(actors)} actors").get("actors")
+        if not isinstance(entries, list):
+            raise ValueError("expected a list of actor entries")
+        params_by_position = {}
+        for entry in entries:
+            if not isinstance(entry, dict) or not isinstance(entry.get("parameters"), list):
+                continue
+            index = entry.get("index")
+            if isinstance(index, int) and 1 <= index <= len(actors):
+                # Only keep the requested number; the first entry for an index wins
+                params_by_position.setdefault(index - 1, entry["parameters"][:num_params])
+        return params_by_position
+    except Exception as e:
+        print(f"❌ Failed to generate batched parameters for {len(actors)} actors: {e}")
+        if response is not None:
+            print("Raw LLM output:", response)
+        return None
+
 def add_parameters_recursively(actor: Dict[str, Any], num_params: int, model_provider: str, model_name: str, pbar: tqdm = None):
     """
     Add parameters to this actor and all sub-actors recursively.
@@ -103,8 +203,8 @@ def main(model_provider="anthropic", model_name="claude-3-5-sonnet-latest", num_
     init_logs_dir = backend_dir / "init_logs"
     features_json_path = find_latest_deepest_json(init_logs_dir)
     print(f"📄 Loading: {features_json_path}")
-    with open(features_json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with open(features_json_path, 'rb') as f:
+        data = orjson.loads(f.read())
     
     # Count total actors first
     actors = data.get('actors', [])
@@ -124,8 +224,8 @@ def main(model_provider="anthropic", model_name="claude-3-5-sonnet-latest", num_
     
     # Save new file
     out_path = features_json_path.parent / (features_json_path.stem + "_with_params.json")
-    with open(out_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(out_path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     print(f"✅ Saved with parameters: {out_path}")
 
 if __name__ == "__main__":
@@ -6,9 +6,166 @@ This module contains all the prompt templates and generation logic for:
 - Level-specific sub-actor generation (Levels 1-4+)
 """
 
-from typing import Tuple
+import sys
+from enum import IntEnum
+from functools import lru_cache
+from typing import Dict, Final, List, Tuple
 
 
+class Level(IntEnum):
+    """Level-down generation levels; plain ints compare equal, so callers may pass either"""
+    COUNTRY = 1
+    COMPANY = 2
+    PERSON = 3
+    MOVEMENT = 4
+
+
+# ==================== LEVEL-DOWN SYSTEM PROMPTS ====================
+
+# The system prompt is identical for every parent actor at a given level, so
+# providers can cache it; the real parent name is only given in the user prompt
+PARENT_ACTOR_PLACEHOLDER = "<PARENT_ACTOR>"
+
+_SCHEMA_INTRO = "Return ONLY a valid JSON object matching this exact shape (single line, no extra keys):\n"
+_SCHEMA_OUTRO = "\n\nDo not include any explanation or text outside the JSON.\n\n"
+# Closes every level's schema: the item's parent_actor field plus the top-level one
+_SCHEMA_PARENT_FIELDS = "".join((
+    '"parent_actor":"', PARENT_ACTOR_PLACEHOLDER, '"}],"parent_actor":"', PARENT_ACTOR_PLACEHOLDER, '"}'
+))
+
+
+def _system_prompt(*parts: str) -> str:
+    """Join prompt parts in a single allocation and intern the result"""
+    return sys.intern("".join(parts))
+
+
+# Level 1: Countries/Nations focus
+_SYS_PREFIX_COUNTRY = (
+    "You are an expert in geopolitics and international relations specializing in national governance structures. "
+    "Your task is to identify the most influential governmental, institutional, and organizational sub-entities "
+    "within a given country or nation-state. Focus on the key power centers that shape national policy and influence.\n\n"
+)
+# schema: {"sub_actors": [{"name": ..., "description": ..., "type": ..., "parent_actor": ...}], "parent_actor": ...}
+_SCHEMA_COUNTRY = (
+    '{"sub_actors":[{"name":"Sub-Actor Name",'
+    '"description":"Detailed description of their governmental role and national influence",'
+    '"type":"government|ministry|agency|party|military|institution|other",'
+)
+
+# Level 2: Companies/Corporations focus
+_SYS_PREFIX_COMPANY = (
+    "You are an expert in corporate analysis and business strategy specializing in organizational hierarchies "
+    "and corporate power structures. Your task is to identify the most influential companies, corporations, "
+    "and business entities that operate within or significantly influence a given parent entity.\n\n"
+)
+# schema: {"sub_actors": [{"name": ..., "description": ..., "type": ..., "parent_actor": ...}], "parent_actor": ...}
+_SCHEMA_COMPANY = (
+    '{"sub_actors":[{"name":"Company/Corporation Name",'
+    '"description":"Detailed description of their business role and market influence",'
+    '"type":"corporation|company|enterprise|conglomerate|startup|subsidiary|other",'
+)
+
+# Level 3: Famous People/Individuals focus
+_SYS_PREFIX_PERSON = (
+    "You are an expert in influence networks and celebrity analysis specializing in identifying the most "
+    "influential individuals, leaders, and public figures. Your task is to identify the most impactful "
+    "people who significantly influence, lead, or represent a given parent entity.\n\n"
+)
+# schema: {"sub_actors": [{"name": ..., "description": ..., "type": ..., "parent_actor": ...}], "parent_actor": ...}
+_SCHEMA_PERSON = (
+    '{"sub_actors":[{"name":"Individual Name",'
+    '"description":"Detailed description of their role, achievements, and influence",'
+    '"type":"ceo|leader|celebrity|politician|expert|influencer|founder|other",'
+)
+
+# Level 4: Social movements, trends, and influencers focus
+_SYS_PREFIX_MOVEMENT = (
+    "You are an expert in social dynamics, cultural trends, and grassroots movements specializing in "
+    "identifying emerging social phenomena, movements, and cultural influencers. Your task is to identify "
+    "the most influential social movements, trends, and cultural phenomena associated with a given parent entity.\n\n"
+)
+# schema: {"sub_actors": [{"name": ..., "description": ..., "type": ..., "parent_actor": ...}], "parent_actor": ...}
+_SCHEMA_MOVEMENT = (
+    '{"sub_actors":[{"name":"Movement/Trend/Phenomenon Name",'
+    '"description":"Detailed description of the social/cultural phenomenon and its influence",'
+    '"type":"movement|trend|phenomenon|campaign|community|culture|activism|other",'
+)
+
+# Default fallback for levels > 4
+_SYS_PREFIX_DEFAULT = (
+    "You are an expert analyst specializing in organizational structures, hierarchies, and influence networks. "
+    "Your task is to identify and analyze the most influential sub-entities within a given main actor. "
+    "These sub-actors should be the key components that collectively make up the main actor's influence and power.\n\n"
+)
+# schema: {"sub_actors": [{"name": ..., "description": ..., "type": ..., "parent_actor": ...}], "parent_actor": ...}
+_SCHEMA_DEFAULT = (
+    '{"sub_actors":[{"name":"Sub-Actor Name",'
+    '"description":"Detailed description of their role and influence within the parent actor",'
+    '"type":"administration|company|movement|individual|department|institution|faction|other",'
+)
+
+# Complete system prompt per level, interned so every call hands out the same
+# object and downstream hashing/identity checks on the system prompt are free
+_SYS_BY_LEVEL = {
+    Level.COUNTRY: _system_prompt(_SYS_PREFIX_COUNTRY, _SCHEMA_INTRO, _SCHEMA_COUNTRY, _SCHEMA_PARENT_FIELDS, _SCHEMA_OUTRO),
+    Level.COMPANY: _system_prompt(_SYS_PREFIX_COMPANY, _SCHEMA_INTRO, _SCHEMA_COMPANY, _SCHEMA_PARENT_FIELDS, _SCHEMA_OUTRO),
+    Level.PERSON: _system_prompt(_SYS_PREFIX_PERSON, _SCHEMA_INTRO, _SCHEMA_PERSON, _SCHEMA_PARENT_FIELDS, _SCHEMA_OUTRO),
+    Level.MOVEMENT: _system_prompt(_SYS_PREFIX_MOVEMENT, _SCHEMA_INTRO, _SCHEMA_MOVEMENT, _SCHEMA_PARENT_FIELDS, _SCHEMA_OUTRO),
+}
+# Fallback for levels > 4
+_SYS_DEFAULT = _system_prompt(_SYS_PREFIX_DEFAULT, _SCHEMA_INTRO, _SCHEMA_DEFAULT, _SCHEMA_PARENT_FIELDS, _SCHEMA_OUTRO)
+
+# Prompt builders are pure functions of small hashable inputs, so repeated
+# calls (retries, reruns, duplicate actors) are served from an LRU cache
+PROMPT_CACHE_SIZE = 4096
+
+
+# ==================== INITIAL ACTOR PROMPTS ====================
+
+_INITIAL_SYSTEM: Final[str] = sys.intern(
+    "You are an expert in geopolitics, international relations, and global power dynamics. "
+    "Your task is to identify and rank the most influential actors that shape our world today. "
+    "These actors should be the ones with the greatest impact on global economics, politics, "
+    "technology, culture, and society. Focus on entities that have the power to influence "
+    "international relations, global markets, and major world events.\n\n"
+    
+    # schema: {"actors": [{"name": ..., "description": ..., "type": ...}]}
+    "Return ONLY a valid JSON object matching this exact shape (single line, no extra keys):\n"
+    '{"actors":[{"name":"Actor Name","description":"Brief description of their influence and role",'
+    '"type":"country|company|organization|individual|alliance"}]}\n\n'
+    "Do not include any explanation or text outside the JSON.\n\n"
+)
+
+_INITIAL_USER_TEMPLATE: Final[str] = (
+    "Generate a list of the {n} most influential actors in the world today. "
+    "These should be the entities that have the greatest power to shape global dynamics. "
+    "Consider the following categories and prioritize the most impactful:\n\n"
+    
+    "**Countries**: Major world powers, economic superpowers, regional hegemons\n"
+    "**Companies**: Multinational corporations, tech giants, financial institutions, energy companies\n"
+    "**Organizations**: International bodies (UN, IMF, WTO), military alliances (NATO), economic blocs (EU, G7, G20)\n"
+    "**Individuals**: World leaders, tech moguls, financial leaders, influential figures\n"
+    "**Alliances**: Political, economic, or military partnerships\n\n"
+    
+    "For each actor, provide:\n"
+    "- **name**: The official name of the actor\n"
+    "- **description**: A concise explanation of their influence and global impact\n"
+    "- **type**: One of: country, company, organization, individual, alliance\n"
+    
+    "Rank them by influence score (highest first). Consider factors like:\n"
+    "- Economic power and market capitalization\n"
+    "- Political influence and diplomatic reach\n"
+    "- Military capabilities and strategic importance\n"
+    "- Technological innovation and control\n"
+    "- Cultural and social influence\n"
+    "- Resource control and energy influence\n"
+    "- Population and demographic impact\n\n"
+    
+    "Return exactly {n} actors in the JSON format specified above."
+)
+
+
+@lru_cache(maxsize=PROMPT_CACHE_SIZE)
 def generate_initial_actor_prompts(num_actors: int) -> Tuple[str, str]:
     """
     Generate system and user prompts for initial actor generation (Level 0).
@@ -20,58 +177,222 @@ def generate_initial_actor_prompts(num_actors: int) -> Tuple[str, str]:
         Tuple[str, str]: (system_context, user_context)
     """
     
-    system_context = (
-        "You are an expert in geopolitics, international relations, and global power dynamics. "
-        "Your task is to identify and rank the most influential actors that shape our world today. "
-        "These actors should be the ones with the greatest impact on global economics, politics, "
-        "technology, culture, and society. Focus on entities that have the power to influence "
-        "international relations, global markets, and major world events.\n\n"
-        
-        "Return ONLY a valid JSON object with the following structure:\n"
-        "{\n"
-        '  "actors": [\n'
-        '    {\n'
-        '      "name": "Actor Name",\n'
-        '      "description": "Brief description of their influence and role",\n'
-        '      "type": "country|company|organization|individual|alliance"\n'
-        '    }\n'
-        '  ],\n'
-        '  "total_count": number_of_actors\n'
-        "}\n\n"
-        "Do not include any explanation or text outside the JSON.\n\n"
-    )
-
-    user_context = (
-        f"Generate a list of the {num_actors} most influential actors in the world today. "
-        "These should be the entities that have the greatest power to shape global dynamics. "
-        "Consider the following categories and prioritize the most impactful:\n\n"
-        
-        "**Countries**: Major world powers, economic superpowers, regional hegemons\n"
-        "**Companies**: Multinational corporations, tech giants, financial institutions, energy companies\n"
-        "**Organizations**: International bodies (UN, IMF, WTO), military alliances (NATO), economic blocs (EU, G7, G20)\n"
-        "**Individuals**: World leaders, tech moguls, financial leaders, influential figures\n"
-        "**Alliances**: Political, economic, or military partnerships\n\n"
-        
-        "For each actor, provide:\n"
-        "- **name**: The official name of the actor\n"
-        "- **description**: A concise explanation of their influence and global impact\n"
-        "- **type**: One of: country, company, organization, individual, alliance\n"
-        
-        "Rank them by influence score (highest first). Consider factors like:\n"
-        "- Economic power and market capitalization\n"
-        "- Political influence and diplomatic reach\n"
-        "- Military capabilities and strategic importance\n"
-        "- Technological innovation and control\n"
-        "- Cultural and social influence\n"
-        "- Resource control and energy influence\n"
-        "- Population and demographic impact\n\n"
-        
-        f"Return exactly {num_actors} actors in the JSON format specified above."
-    )
+    return _INITIAL_SYSTEM, _INITIAL_USER_TEMPLATE.format(n=num_actors)
+
+
+# ==================== LEVEL-DOWN USER PROMPTS ====================
+
+# Level 1: Countries/Nations focus
+_USER_TEMPLATE_COUNTRY = (
+    "Analyze the following country/nation and generate {num_subactors} most influential governmental and institutional sub-actors:\n\n"
+    "**Country/Nation**: {actor_name}\n"
+    "**Type**: {actor_type}\n"
+    "**Description**: {actor_description}\n\n"
+    
+    "Generate the {num_subactors} most influential governmental and institutional sub-actors within this nation. "
+    "Focus on: government branches, key ministries, military divisions, intelligence agencies, major political parties, "
+    "central banks, supreme courts, regulatory bodies, and other key national institutions.\n\n"
+    
+    "For each sub-actor, provide:\n"
+    "- **name**: The official name of the governmental/institutional entity\n"
+    "- **description**: Their specific role in national governance and policy influence\n"
+    "- **type**: Category (government, ministry, agency, party, military, institution, etc.)\n"
+    
+    "Rank by influence score (highest first). Focus on entities that directly shape national policy, "
+    "governance, and strategic decisions.\n\n"
     
-    return system_context, user_context
+    "Return exactly {num_subactors} sub-actors in the JSON format specified above. "
+    'Use "{actor_name}" as the value of every "parent_actor" field.'
+)
 
+# Level 2: Companies/Corporations focus
+_USER_TEMPLATE_COMPANY = (
+    "Analyze the following entity and generate {num_subactors} most influential companies and corporations associated with it:\n\n"
+    "**Parent Entity**: {actor_name}\n"
+    "**Type**: {actor_type}\n"
+    "**Description**: {actor_description}\n\n"
+    
+    "Generate the {num_subactors} most influential companies and corporations that either operate within, "
+    "are based in, or significantly influence this parent entity. Focus on: major corporations, "
+    "multinational companies, key industry leaders, influential startups, state-owned enterprises, "
+    "conglomerates, and major business groups.\n\n"
+    
+    "For each sub-actor, provide:\n"
+    "- **name**: The official company/corporation name\n"
+    "- **description**: Their business focus, market position, and influence within the parent entity\n"
+    "- **type**: Category (corporation, company, enterprise, conglomerate, startup, subsidiary, etc.)\n"
+    
+    "Rank by influence score (highest first). Focus on entities that drive economic activity, "
+    "innovation, employment, and strategic business influence.\n\n"
+    
+    "Return exactly {num_subactors} sub-actors in the JSON format specified above. "
+    'Use "{actor_name}" as the value of every "parent_actor" field.'
+)
 
+# Level 3: Famous People/Individuals focus
+_USER_TEMPLATE_PERSON = (
+    "Analyze the following entity and generate {num_subactors} most influential individuals and famous people associated with it:\n\n"
+    "**Parent Entity**: {actor_name}\n"
+    "**Type**: {actor_type}\n"
+    "**Description**: {actor_description}\n\n"
+    
+    "Generate the {num_subactors} most influential individuals who lead, represent, or significantly "
+    "influence this parent entity. Focus on: CEOs and executives, political leaders, celebrities, "
+    "founders and entrepreneurs, thought leaders, experts and academics, public figures, and other "
+    "influential personalities.\n\n"
+    
+    "For each sub-actor, provide:\n"
+    "- **name**: The individual's full name (real person)\n"
+    "- **description**: Their role, achievements, and specific influence within/on the parent entity\n"
+    "- **type**: Category (ceo, leader, celebrity, politician, expert, influencer, founder, etc.)\n"
+    
+    "Rank by influence score (highest first). Focus on individuals who shape decisions, "
+    "represent the entity publicly, or have significant impact on its direction.\n\n"
+    
+    "Return exactly {num_subactors} sub-actors in the JSON format specified above. "
+    'Use "{actor_name}" as the value of every "parent_actor" field.'
+)
+
+# Level 4: Social movements, trends, and influencers focus
+_USER_TEMPLATE_MOVEMENT = (
+    "Analyze the following entity and generate {num_subactors} most influential social movements, trends, and cultural phenomena associated with it:\n\n"
+    "**Parent Entity**: {actor_name}\n"
+    "**Type**: {actor_type}\n"
+    "**Description**: {actor_description}\n\n"
+    
+    "Generate the {num_subactors} most influential social movements, cultural trends, and grassroots "
+    "phenomena that either originate from, are supported by, or significantly influence this parent entity. "
+    "Focus on: social movements, cultural trends, activist campaigns, online communities, "
+    "grassroots initiatives, cultural phenomena, and influential social dynamics.\n\n"
+    
+    "For each sub-actor, provide:\n"
+    "- **name**: The name of the movement, trend, or phenomenon\n"
+    "- **description**: Their social/cultural impact and influence within/on the parent entity\n"
+    "- **type**: Category (movement, trend, phenomenon, campaign, community, culture, activism, etc.)\n"
+    
+    "Rank by influence score (highest first). Focus on phenomena that shape public opinion, "
+    "cultural direction, and social change within the parent entity's sphere.\n\n"
+    
+    "Return exactly {num_subactors} sub-actors in the JSON format specified above. "
+    'Use "{actor_name}" as the value of every "parent_actor" field.'
+)
+
+# Default fallback for levels > 4
+_USER_TEMPLATE_DEFAULT = (
+    "Analyze the following main actor and generate {num_subactors} most influential sub-actors within it:\n\n"
+    "**Main Actor**: {actor_name}\n"
+    "**Type**: {actor_type}\n"
+    "**Description**: {actor_description}\n\n"
+    
+    "Generate the {num_subactors} most influential sub-actors that make up or significantly influence this main actor. "
+    "Consider the most relevant sub-entities based on the parent actor's nature and context.\n\n"
+    
+    "For each sub-actor, provide:\n"
+    "- **name**: The specific name of the sub-actor\n"
+    "- **description**: A detailed explanation of their role, influence, and importance within the parent actor\n"
+    "- **type**: The category of sub-actor (be specific based on context)\n"
+    
+    "Rank them by influence score within the parent actor's context (highest first). "
+    "Focus on the most powerful and influential components that shape the main actor's behavior and decisions.\n\n"
+    
+    "Return exactly {num_subactors} sub-actors in the JSON format specified above. "
+    'Use "{actor_name}" as the value of every "parent_actor" field.'
+)
+
+# Per-level user prompt templates; level 0 is the fallback for levels > 4
+_USER_TEMPLATE_BY_LEVEL = {
+    Level.COUNTRY: _USER_TEMPLATE_COUNTRY,
+    Level.COMPANY: _USER_TEMPLATE_COMPANY,
+    Level.PERSON: _USER_TEMPLATE_PERSON,
+    Level.MOVEMENT: _USER_TEMPLATE_MOVEMENT,
+    0: _USER_TEMPLATE_DEFAULT,
+}
+
+# Templates with the common sub-actor counts already baked in, keyed by (level, num_subactors)
+_USER_TEMPLATES: Dict[Tuple[int, int], str] = {}
+
+
+def _warmup(levels: List[int], counts: List[int]) -> None:
+    """Pre-render the user prompt templates for the given levels and sub-actor counts"""
+    for level in levels:
+        for count in counts:
+            _USER_TEMPLATES[(level, count)] = _USER_TEMPLATE_BY_LEVEL[level].replace(
+                "{num_subactors}", str(count)
+            )
+
+
+_warmup([0, *Level], [5, 8, 10, 15, 20])
+
+
+def _render_user_context(level: int, actor_name: str, actor_description: str, actor_type: str,
+                         num_subactors: int) -> str:
+    """Fill in the user prompt for *level*, using a pre-rendered template when one exists"""
+    template = _USER_TEMPLATES.get((level, num_subactors))
+    if template is not None:
+        return template.format_map({
+            "actor_name": actor_name,
+            "actor_description": actor_description,
+            "actor_type": actor_type,
+        })
+    return _USER_TEMPLATE_BY_LEVEL[level].format_map({
+        "actor_name": actor_name,
+        "actor_description": actor_description,
+        "actor_type": actor_type,
+        "num_subactors": num_subactors,
+    })
+
+
+# ==================== LEVEL-DOWN PROMPT BUILDERS ====================
+
+def _build_level_1(actor_name: str, actor_description: str, actor_type: str,
+                   num_subactors: int) -> Tuple[str, str]:
+    """Level 1: Countries/Nations focus"""
+    return _SYS_BY_LEVEL[Level.COUNTRY], _render_user_context(Level.COUNTRY, actor_name, actor_description, actor_type, num_subactors)
+
+
+def _build_level_2(actor_name: str, actor_description: str, actor_type: str,
+                   num_subactors: int) -> Tuple[str, str]:
+    """Level 2: Companies/Corporations focus"""
+    return _SYS_BY_LEVEL[Level.COMPANY], _render_user_context(Level.COMPANY, actor_name, actor_description, actor_type, num_subactors)
+
+
+def _build_level_3(actor_name: str, actor_description: str, actor_type: str,
+                   num_subactors: int) -> Tuple[str, str]:
+    """Level 3: Famous People/Individuals focus"""
+    return _SYS_BY_LEVEL[Level.PERSON], _render_user_context(Level.PERSON, actor_name, actor_description, actor_type, num_subactors)
+
+
+def _build_level_4(actor_name: str, actor_description: str, actor_type: str,
+                   num_subactors: int) -> Tuple[str, str]:
+    """Level 4: Social movements, trends, and influencers focus"""
+    return _SYS_BY_LEVEL[Level.MOVEMENT], _render_user_context(Level.MOVEMENT, actor_name, actor_description, actor_type, num_subactors)
+
+
+def _build_default(actor_name: str, actor_description: str, actor_type: str,
+                   num_subactors: int) -> Tuple[str, str]:
+    """Default fallback for levels > 4"""
+    return _SYS_DEFAULT, _render_user_context(0, actor_name, actor_description, actor_type, num_subactors)
+
+
+_LEVEL_BUILDERS = {
+    Level.COUNTRY: _build_level_1,
+    Level.COMPANY: _build_level_2,
+    Level.PERSON: _build_level_3,
+    Level.MOVEMENT: _build_level_4,
+}
+
+
+def get_leveldown_system_context(current_level: int) -> str:
+    """
+    Get the system prompt for a level on its own.
+    
+    It doesn't depend on the parent actor (or the sub-actor count), so callers expanding
+    many parents at one level can fetch it once and reuse it for every request.
+    """
+    return _SYS_BY_LEVEL.get(current_level, _SYS_DEFAULT)
+
+
+@lru_cache(maxsize=PROMPT_CACHE_SIZE)
 def generate_leveldown_prompts(actor_name: str, actor_description: str, actor_type: str, 
                               num_subactors: int, current_level: int) -> Tuple[str, str]:
     """
@@ -88,226 +409,6 @@ def generate_leveldown_prompts(actor_name: str, actor_description: str, actor_ty
         Tuple[str, str]: (system_context, user_context)
     """
     
-    if current_level == 1:
-        # Level 1: Countries/Nations focus
-        system_context = (
-            "You are an expert in geopolitics and international relations specializing in national governance structures. "
-            "Your task is to identify the most influential governmental, institutional, and organizational sub-entities "
-            "within a given country or nation-state. Focus on the key power centers that shape national policy and influence.\n\n"
-            
-            "Return ONLY a valid JSON object with the following structure:\n"
-            "{\n"
-            '  "sub_actors": [\n'
-            '    {\n'
-            '      "name": "Sub-Actor Name",\n'
-            '      "description": "Detailed description of their governmental role and national influence",\n'
-            '      "type": "government|ministry|agency|party|military|institution|other",\n'
-            '      "parent_actor": "' + actor_name + '"\n'
-            '    }\n'
-            '  ],\n'
-            '  "total_count": number_of_sub_actors,\n'
-            '  "parent_actor": "' + actor_name + '"\n'
-            "}\n\n"
-            "Do not include any explanation or text outside the JSON.\n\n"
-        )
-        
-        user_context = (
-            f"Analyze the following country/nation and generate {num_subactors} most influential governmental and institutional sub-actors:\n\n"
-            f"**Country/Nation**: {actor_name}\n"
-            f"**Type**: {actor_type}\n"
-            f"**Description**: {actor_description}\n\n"
-            
-            f"Generate the {num_subactors} most influential governmental and institutional sub-actors within this nation. "
-            f"Focus on: government branches, key ministries, military divisions, intelligence agencies, major political parties, "
-            f"central banks, supreme courts, regulatory bodies, and other key national institutions.\n\n"
-            
-            "For each sub-actor, provide:\n"
-            "- **name**: The official name of the governmental/institutional entity\n"
-            "- **description**: Their specific role in national governance and policy influence\n"
-            "- **type**: Category (government, ministry, agency, party, military, institution, etc.)\n"
-            
-            "Rank by influence score (highest first). Focus on entities that directly shape national policy, "
-            "governance, and strategic decisions.\n\n"
-            
-            f"Return exactly {num_subactors} sub-actors in the JSON format specified above."
-        )
-    
-    elif current_level == 2:
-        # Level 2: Companies/Corporations focus
-        system_context = (
-            "You are an expert in corporate analysis and business strategy specializing in organizational hierarchies "
-            "and corporate power structures. Your task is to identify the most influential companies, corporations, "
-            "and business entities that operate within or significantly influence a given parent entity.\n\n"
-            
-            "Return ONLY a valid JSON object with the following structure:\n"
-            "{\n"
-            '  "sub_actors": [\n'
-            '    {\n'
-            '      "name": "Company/Corporation Name",\n'
-            '      "description": "Detailed description of their business role and market influence",\n'
-            '      "type": "corporation|company|enterprise|conglomerate|startup|subsidiary|other",\n'
-            '      "parent_actor": "' + actor_name + '"\n'
-            '    }\n'
-            '  ],\n'
-            '  "total_count": number_of_sub_actors,\n'
-            '  "parent_actor": "' + actor_name + '"\n'
-            "}\n\n"
-            "Do not include any explanation or text outside the JSON.\n\n"
-        )
-        
-        user_context = (
-            f"Analyze the following entity and generate {num_subactors} most influential companies and corporations associated with it:\n\n"
-            f"**Parent Entity**: {actor_name}\n"
-            f"**Type**: {actor_type}\n"
-            f"**Description**: {actor_description}\n\n"
-            
-            f"Generate the {num_subactors} most influential companies and corporations that either operate within, "
-            f"are based in, or significantly influence this parent entity. Focus on: major corporations, "
-            f"multinational companies, key industry leaders, influential startups, state-owned enterprises, "
-            f"conglomerates, and major business groups.\n\n"
-            
-            "For each sub-actor, provide:\n"
-            "- **name**: The official company/corporation name\n"
-            "- **description**: Their business focus, market position, and influence within the parent entity\n"
-            "- **type**: Category (corporation, company, enterprise, conglomerate, startup, subsidiary, etc.)\n"
-            
-            "Rank by influence score (highest first). Focus on entities that drive economic activity, "
-            "innovation, employment, and strategic business influence.\n\n"
-            
-            f"Return exactly {num_subactors} sub-actors in the JSON format specified above."
-        )
-    
-    elif current_level == 3:
-        # Level 3: Famous People/Individuals focus
-        system_context = (
-            "You are an expert in influence networks and celebrity analysis specializing in identifying the most "
-            "influential individuals, leaders, and public figures. Your task is to identify the most impactful "
-            "people who significantly influence, lead, or represent a given parent entity.\n\n"
-            
-            "Return ONLY a valid JSON object with the following structure:\n"
-            "{\n"
-            '  "sub_actors": [\n'
-            '    {\n'
-            '      "name": "Individual Name",\n'
-            '      "description": "Detailed description of their role, achievements, and influence",\n'
-            '      "type": "ceo|leader|celebrity|politician|expert|influencer|founder|other",\n'
-            '      "parent_actor": "' + actor_name + '"\n'
-            '    }\n'
-            '  ],\n'
-            '  "total_count": number_of_sub_actors,\n'
-            '  "parent_actor": "' + actor_name + '"\n'
-            "}\n\n"
-            "Do not include any explanation or text outside the JSON.\n\n"
-        )
-        
-        user_context = (
-            f"Analyze the following entity and generate {num_subactors} most influential individuals and famous people associated with it:\n\n"
-            f"**Parent Entity**: {actor_name}\n"
-            f"**Type**: {actor_type}\n"
-            f"**Description**: {actor_description}\n\n"
-            
-            f"Generate the {num_subactors} most influential individuals who lead, represent, or significantly "
-            f"influence this parent entity. Focus on: CEOs and executives, political leaders, celebrities, "
-            f"founders and entrepreneurs, thought leaders, experts and academics, public figures, and other "
-            f"influential personalities.\n\n"
-            
-            "For each sub-actor, provide:\n"
-            "- **name**: The individual's full name (real person)\n"
-            "- **description**: Their role, achievements, and specific influence within/on the parent entity\n"
-            "- **type**: Category (ceo, leader, celebrity, politician, expert, influencer, founder, etc.)\n"
-            
-            "Rank by influence score (highest first). Focus on individuals who shape decisions, "
-            "represent the entity publicly, or have significant impact on its direction.\n\n"
-            
-            f"Return exactly {num_subactors} sub-actors in the JSON format specified above."
-        )
-    
-    elif current_level == 4:
-        # Level 4: Social movements, trends, and influencers focus
-        system_context = (
-            "You are an expert in social dynamics, cultural trends, and grassroots movements specializing in "
-            "identifying emerging social phenomena, movements, and cultural influencers. Your task is to identify "
-            "the most influential social movements, trends, and cultural phenomena associated with a given parent entity.\n\n"
-            
-            "Return ONLY a valid JSON object with the following structure:\n"
-            "{\n"
-            '  "sub_actors": [\n'
-            '    {\n'
-            '      "name": "Movement/Trend/Phenomenon Name",\n'
-            '      "description": "Detailed description of the social/cultural phenomenon and its influence",\n'
-            '      "type": "movement|trend|phenomenon|campaign|community|culture|activism|other",\n'
-            '      "parent_actor": "' + actor_name + '"\n'
-            '    }\n'
-            '  ],\n'
-            '  "total_count": number_of_sub_actors,\n'
-            '  "parent_actor": "' + actor_name + '"\n'
-            "}\n\n"
-            "Do not include any explanation or text outside the JSON.\n\n"
-        )
-        
-        user_context = (
-            f"Analyze the following entity and generate {num_subactors} most influential social movements, trends, and cultural phenomena associated with it:\n\n"
-            f"**Parent Entity**: {actor_name}\n"
-            f"**Type**: {actor_type}\n"
-            f"**Description**: {actor_description}\n\n"
-            
-            f"Generate the {num_subactors} most influential social movements, cultural trends, and grassroots "
-            f"phenomena that either originate from, are supported by, or significantly influence this parent entity. "
-            f"Focus on: social movements, cultural trends, activist campaigns, online communities, "
-            f"grassroots initiatives, cultural phenomena, and influential social dynamics.\n\n"
-            
-            "For each sub-actor, provide:\n"
-            "- **name**: The name of the movement, trend, or phenomenon\n"
-            "- **description**: Their social/cultural impact and influence within/on the parent entity\n"
-            "- **type**: Category (movement, trend, phenomenon, campaign, community, culture, activism, etc.)\n"
-            
-            "Rank by influence score (highest first). Focus on phenomena that shape public opinion, "
-            "cultural direction, and social change within the parent entity's sphere.\n\n"
-            
-            f"Return exactly {num_subactors} sub-actors in the JSON format specified above."
-        )
-    
-    else:
-        # Default fallback for levels > 4
-        system_context = (
-            "You are an expert analyst specializing in organizational structures, hierarchies, and influence networks. "
-            "Your task is to identify and analyze the most influential sub-entities within a given main actor. "
-            "These sub-actors should be the key components that collectively make up the main actor's influence and power.\n\n"
-            
-            "Return ONLY a valid JSON object with the following structure:\n"
-            "{\n"
-            '  "sub_actors": [\n'
-            '    {\n'
-            '      "name": "Sub-Actor Name",\n'
-            '      "description": "Detailed description of their role and influence within the parent actor",\n'
-            '      "type": "administration|company|movement|individual|department|institution|faction|other",\n'
-            '      "parent_actor": "' + actor_name + '"\n'
-            '    }\n'
-            '  ],\n'
-            '  "total_count": number_of_sub_actors,\n'
-            '  "parent_actor": "' + actor_name + '"\n'
-            "}\n\n"
-            "Do not include any explanation or text outside the JSON.\n\n"
-        )
-        
-        user_context = (
-            f"Analyze the following main actor and generate {num_subactors} most influential sub-actors within it:\n\n"
-            f"**Main Actor**: {actor_name}\n"
-            f"**Type**: {actor_type}\n"
-            f"**Description**: {actor_description}\n\n"
-            
-            f"Generate the {num_subactors} most influential sub-actors that make up or significantly influence this main actor. "
-            f"Consider the most relevant sub-entities based on the parent actor's nature and context.\n\n"
-            
-            "For each sub-actor, provide:\n"
-            "- **name**: The specific name of the sub-actor\n"
-            "- **description**: A detailed explanation of their role, influence, and importance within the parent actor\n"
-            "- **type**: The category of sub-actor (be specific based on context)\n"
-            
-            "Rank them by influence score within the parent actor's context (highest first). "
-            "Focus on the most powerful and influential components that shape the main actor's behavior and decisions.\n\n"
-            
-            f"Return exactly {num_subactors} sub-actors in the JSON format specified above."
-        )
-    
-    return system_context, user_context 
\ No newline at end of file
+    build = _LEVEL_BUILDERS.get(current_level, _build_default)
+    return build(actor_name, actor_description, actor_type, num_subactors)
+
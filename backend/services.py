@@ -3,12 +3,19 @@ Service layer for the World Model backend.
 Handles all business logic for actor and parameter generation.
 """
 
+import os
 import json
 import asyncio
+import hashlib
+import logging
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional, List, Tuple
 
+import aiofiles
+import orjson
+
 from .config import get_config
 from .models import (
     Actor, ActorList, SubActor, SubActorList, EnhancedActor, ActorParameter,
@@ -16,21 +23,144 @@ from .models import (
     CompleteMetadata, GenerationOutput, GenerationStatus, SystemStatus
 )
 from .utils import (
-    log_error, log_success, log_info, log_warning,
-    get_run_folder_path, get_latest_run_folder, save_level_data, load_level_data,
-    call_llm_api_async, handle_json_parsing_error, handle_api_error, validate_actor_data
+    log_error, log_success, log_info, log_warning, get_queued_logger,
+    get_run_folder_path, get_latest_run_folder, clear_latest_run_folder_cache,
+    save_level_data_async, load_level_data_async,
+    call_llm_api_async, handle_json_parsing_error, parse_llm_actor_list,
+    handle_api_error, validate_actor_data
 )
 from .llm.llm import call_llm_api, get_cost_session, reset_cost_session
-from .routes.initializationroute.prompts import generate_initial_actor_prompts, generate_leveldown_prompts
+from .parameter_cache import get_parameter_cache, retarget_parameters
+from .routes.initializationroute.prompts import (
+    generate_initial_actor_prompts, generate_leveldown_prompts, get_leveldown_system_context
+)
 # Import functions from the prepared parameter generation script
 from .routes.initializationroute.generate_parameters_for_actors import (
     generate_parameters_for_actor, 
+    generate_parameters_for_actor_batch,
+    parameter_batch_size,
     add_parameters_recursively,
-    count_actors_recursively,
+    collect_actors_recursively,
     find_latest_deepest_json
 )
 
 
+def _parameter_key(actor: Dict[str, Any], num_params: int, model: str) -> str:
+    """Identify parameter generations that would send the same prompt content"""
+    raw = "\x1f".join((str(actor.get('type')), str(actor.get('description')), str(num_params), model))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _actor_output(actor: EnhancedActor) -> Dict[str, Any]:
+    """
+    Level file entry for an actor built with model_construct: every EnhancedActor key
+    (defaults filled in, unknown keys dropped), without re-validating already-checked data.
+    """
+    return actor.model_dump(mode='python', warnings=False)
+
+
+_STREAM_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+def _indented_json(value: Any, depth: int) -> bytes:
+    """orjson OPT_INDENT_2 output for a value nested *depth* levels into the document"""
+    # Strings never contain a raw newline (orjson escapes them), so every b"\n" is layout
+    return orjson.dumps(value, option=_STREAM_JSON_OPTIONS).replace(b"\n", b"\n" + b"  " * depth)
+
+
+def _member_json(key: Any, value: Any) -> bytes:
+    """One top-level '"key": value' member of an OPT_INDENT_2 document"""
+    return b'  ' + orjson.dumps(str(key)) + b': ' + _indented_json(value, 1)
+
+
+class _StreamingParametersWriter:
+    """
+    Writes the parameter output file incrementally, one finished top-level actor at a time.
+    
+    The file is built at <out>.partial: the header keys before "actors", then '"actors": [',
+    then each finished actor. After every actor, <out>.progress.json records how many actors
+    are in the file and the byte offset where the last one ends. A later run with the same
+    settings recovers those actors and carries on after them. finish() closes the array,
+    writes the keys that follow "actors" and moves the file into place. The finished file is
+    byte-for-byte what orjson.dumps(data, option=OPT_INDENT_2) would produce.
+    """
+    
+    def __init__(self, out_path: Path, data: Dict[str, Any], num_params: int, model: str):
+        self.out_path = out_path
+        self.partial_path = out_path.with_name(out_path.stem + ".partial")
+        self.progress_path = out_path.with_name(out_path.stem + ".progress.json")
+        # Keep the document's key order: members before "actors" open the file, the rest close it
+        keys = list(data)
+        split = keys.index('actors') if 'actors' in keys else len(keys)
+        self.head = [(key, data[key]) for key in keys[:split]]
+        self.tail = [(key, data[key]) for key in keys[split + 1:]]
+        self.settings = {"num_params": num_params, "model": model}
+        self.completed = 0
+        self._file = None
+    
+    def open(self) -> List[Dict[str, Any]]:
+        """Open the partial file and return the top-level actors recovered from an interrupted run"""
+        recovered = []
+        try:
+            progress = orjson.loads(self.progress_path.read_bytes())
+            if progress["settings"] == self.settings and progress["completed"] > 0:
+                with open(self.partial_path, 'rb') as f:
+                    written = f.read(progress["offset"])
+                # The file stops right after the last actor: close the array and the object
+                recovered = orjson.loads(written + b"]}")["actors"]
+        except (FileNotFoundError, orjson.JSONDecodeError, KeyError, TypeError):
+            recovered = []
+        
+        if recovered:
+            self.completed = len(recovered)
+            self._file = open(self.partial_path, 'r+b')
+            self._file.truncate(progress["offset"])
+            self._file.seek(progress["offset"])
+            return recovered
+        
+        self._file = open(self.partial_path, 'wb')
+        self._file.write(b"{\n" + b"".join(_member_json(key, value) + b",\n" for key, value in self.head)
+                         + b'  "actors": [')
+        return recovered
+    
+    def write_actor(self, actor: Dict[str, Any]) -> None:
+        """Append one finished top-level actor and checkpoint the progress"""
+        separator = b",\n    " if self.completed else b"\n    "
+        self._file.write(separator + _indented_json(actor, 2))
+        self._file.flush()
+        self.completed += 1
+        
+        progress_tmp = self.progress_path.with_suffix(".tmp")
+        progress_tmp.write_bytes(orjson.dumps({
+            "settings": self.settings,
+            "completed": self.completed,
+            "offset": self._file.tell()
+        }))
+        os.replace(progress_tmp, self.progress_path)
+    
+    def finish(self) -> None:
+        """Close the actors array, add the remaining keys, move the file into place and drop the checkpoint"""
+        self._file.write((b"\n  ]" if self.completed else b"]")
+                         + b"".join(b",\n" + _member_json(key, value) for key, value in self.tail)
+                         + b"\n}")
+        self._file.close()
+        os.replace(self.partial_path, self.out_path)
+        self.progress_path.unlink(missing_ok=True)
+    
+    def close(self) -> None:
+        """Close the file but keep the partial output and checkpoint for a later resume"""
+        if self._file:
+            self._file.close()
+
+
+# Most sibling actors sent to the LLM in a single parameter-generation prompt
+# (fewer if the model's output token limit can't fit them, see parameter_batch_size)
+PARAMETER_BATCH_SIZE = 8
+
+# Per-actor messages inside the fan-outs go through a queued logger (see get_queued_logger)
+logger = get_queued_logger("services")
+
+
 class GenerationService:
     """Service class for handling actor and parameter generation"""
     
@@ -44,6 +174,34 @@ class GenerationService:
             status="idle",
             message="Ready to generate parameters"
         )
+        # Parameter generations currently running, keyed by _parameter_key (single-flight)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # ISO timestamp cached for up to a second (see _now_iso)
+        self._last_ts_ns: int = 0
+        self._last_ts_str: str = ""
+        # Last per-actor parameter progress update (see _report_parameter_progress)
+        self._last_status_emit_ns: int = 0
+    
+    def _now_iso(self) -> str:
+        """Current time as ISO string, refreshed at most once per second"""
+        t = time.monotonic_ns()
+        if t - self._last_ts_ns > 1_000_000_000:
+            self._last_ts_ns = t
+            self._last_ts_str = datetime.now().isoformat()
+        return self._last_ts_str
+    
+    def _report_parameter_progress(self, message: str, progress: float, force: bool = False):
+        """
+        Per-actor progress for a running parameter generation, throttled to one update per
+        200ms (unless forced). Only message and progress change - the rest of the status
+        is already set by the update_parameter_status call that started the phase.
+        """
+        t = time.monotonic_ns()
+        if not force and t - self._last_status_emit_ns < 200_000_000:
+            return
+        self._last_status_emit_ns = t
+        self.parameter_status.message = message
+        self.parameter_status.progress = progress
     
     def get_status(self) -> SystemStatus:
         """Get current system status"""
@@ -64,9 +222,9 @@ class GenerationService:
         self.actor_status.error = error
         
         if status == "running" and self.actor_status.start_time is None:
-            self.actor_status.start_time = datetime.now().isoformat()
+            self.actor_status.start_time = self._now_iso()
         elif status in ["completed", "failed"]:
-            self.actor_status.end_time = datetime.now().isoformat()
+            self.actor_status.end_time = self._now_iso()
     
     def update_parameter_status(self, status: str, message: str, 
                               progress: Optional[float] = None, 
@@ -80,9 +238,9 @@ class GenerationService:
         self.parameter_status.error = error
         
         if status == "running" and self.parameter_status.start_time is None:
-            self.parameter_status.start_time = datetime.now().isoformat()
+            self.parameter_status.start_time = self._now_iso()
         elif status in ["completed", "failed"]:
-            self.parameter_status.end_time = datetime.now().isoformat()
+            self.parameter_status.end_time = self._now_iso()
 
     async def generate_actors_async(self, provider: str, model: str, 
                                   num_actors: int, num_subactors: int, 
@@ -105,7 +263,8 @@ class GenerationService:
                 target_depth=target_depth,
                 skip_on_error=skip_on_error
             )
-            print(f"🔧 Run OG script complete")
+            # The delegated script creates its own run folder
+            clear_latest_run_folder_cache()
             if run_folder:
                 self.update_actor_status(
                     "completed",
@@ -217,13 +376,13 @@ class GenerationService:
         
         # Generate prompts
         system_context, user_context = generate_initial_actor_prompts(num_actors)
-        full_prompt = system_context + user_context
         
         try:
             # Call LLM API
             response = await call_llm_api_async(
                 call_llm_api,
-                prompt=full_prompt,
+                prompt=user_context,
+                system=system_context,
                 model_provider=provider,
                 model_name=model,
                 max_tokens=self.config.llm.max_tokens,
@@ -232,14 +391,16 @@ class GenerationService:
             
             # Parse and validate response
             try:
-                raw_data = json.loads(response)
+                raw_data = parse_llm_actor_list(response, "actors", f"Level 0 generation with {num_actors} actors")
+                # total_count is not requested from the model - derive it
+                raw_data["total_count"] = len(raw_data.get("actors", []))
                 actors_list = ActorList(**raw_data)
                 
                 # Prepare output data
                 cost_data = get_cost_session()
                 output_data = {
                     "metadata": {
-                        "timestamp": datetime.now().isoformat(),
+                        "timestamp": self._now_iso(),
                         "run_folder": run_folder.name,
                         "model_provider": provider,
                         "model_name": model,
@@ -255,7 +416,7 @@ class GenerationService:
                 }
                 
                 # Save results
-                save_level_data(output_data, 0, run_folder)
+                await save_level_data_async(output_data, 0, run_folder)
                 
                 return actors_list
                 
@@ -284,24 +445,31 @@ class GenerationService:
     async def _generate_subactors_for_actor_async(self, actor_data: Dict[str, Any], 
                                                 provider: str, model: str, 
                                                 num_subactors: int, current_level: int,
-                                                actor_index: int = 0) -> SubActorList:
-        """Generate sub-actors for a specific actor (async version)"""
+                                                actor_index: int = 0,
+                                                system_context: Optional[str] = None) -> SubActorList:
+        """
+        Generate sub-actors for a specific actor (async version).
+        
+        system_context can be passed in by callers that already fetched the level's
+        system prompt; only the user prompt is built per actor.
+        """
         
         actor_name = actor_data["name"]
         actor_description = actor_data["description"]
         actor_type = actor_data["type"]
         
         # Generate prompts
-        system_context, user_context = generate_leveldown_prompts(
+        level_system_context, user_context = generate_leveldown_prompts(
             actor_name, actor_description, actor_type, num_subactors, current_level
         )
-        full_prompt = system_context + user_context
+        system_context = system_context or level_system_context
         
         try:
             # Call LLM API
             response = await call_llm_api_async(
                 call_llm_api,
-                prompt=full_prompt,
+                prompt=user_context,
+                system=system_context,
                 model_provider=provider,
                 model_name=model,
                 max_tokens=3000,
@@ -310,10 +478,17 @@ class GenerationService:
             
             # Parse and validate response
             try:
-                raw_data = json.loads(response)
+                raw_data = parse_llm_actor_list(
+                    response, "sub_actors", f"Sub-actor generation for {actor_name}",
+                    required_fields=('name', 'description', 'type', 'parent_actor'),
+                    parent_actor=actor_name
+                )
+                # total_count is not requested from the model - derive it
+                raw_data["total_count"] = len(raw_data.get("sub_actors", []))
                 sub_actors_list = SubActorList(**raw_data)
                 
-                log_info(f"Generated {sub_actors_list.total_count} sub-actors for {actor_name}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Generated %d sub-actors for %s", sub_actors_list.total_count, actor_name)
                 return sub_actors_list
                 
             except json.JSONDecodeError as e:
@@ -344,13 +519,15 @@ class GenerationService:
         log_info(f"Generating Level {target_level} sub-actors from Level {source_level}")
         
         # Load source level data
-        source_data = load_level_data(source_level, run_folder)
+        source_data = await load_level_data_async(source_level, run_folder)
         if not source_data:
             return None
         
         parent_actors = source_data.get("actors", [])
         total_subactors = 0
         enhanced_actors = []
+        # Plain dicts for the output file, in EnhancedActor's shape (see _actor_output)
+        output_actors = []
         successful_actors = failed_actors = 0
         
         # Get original metadata
@@ -360,20 +537,26 @@ class GenerationService:
             original_metadata = source_data.get("metadata", {}).get("original_metadata", 
                                                                    source_data.get("metadata", {}))
         
+        tasks = []
+        # Same system prompt for every parent at this level - fetch it once
+        system_context = get_leveldown_system_context(target_level)
+        
         if source_level == 0:
             # Level 0->1: Process main actors in parallel
-            tasks = []
             actors_to_process = []
             
             for i, actor_data in enumerate(parent_actors):
                 if actor_data.get("sub_actors"):
                     # Already has sub-actors
-                    enhanced_actors.append(EnhancedActor(**actor_data))
+                    enhanced_actor = EnhancedActor.model_construct(**actor_data)
+                    enhanced_actors.append(enhanced_actor)
+                    output_actors.append(_actor_output(enhanced_actor))
                     continue
                 
                 # Create async task
                 task = self._generate_subactors_for_actor_async(
-                    actor_data, provider, model, num_subactors, target_level, i
+                    actor_data, provider, model, num_subactors, target_level, i,
+                    system_context=system_context
                 )
                 tasks.append(task)
                 actors_to_process.append(actor_data)
@@ -389,18 +572,23 @@ class GenerationService:
                         if isinstance(result, Exception):
                             failed_actors += 1
                             if skip_on_error:
-                                log_warning(f"Skipping {actor_data['name']} due to error")
-                                enhanced_actors.append(EnhancedActor(**actor_data))
+                                logger.warning("Skipping %s due to error", actor_data['name'])
+                                enhanced_actor = EnhancedActor.model_construct(**actor_data)
+                                enhanced_actors.append(enhanced_actor)
+                                output_actors.append(_actor_output(enhanced_actor))
                             else:
                                 raise result
                         else:
-                            enhanced_actors.append(EnhancedActor(
+                            # result is already validated - skip re-validation
+                            enhanced_actor = EnhancedActor.model_construct(
                                 name=actor_data["name"],
                                 description=actor_data["description"],
                                 type=actor_data["type"],
                                 sub_actors=result.sub_actors,
                                 sub_actors_count=result.total_count,
-                            ))
+                            )
+                            enhanced_actors.append(enhanced_actor)
+                            output_actors.append(_actor_output(enhanced_actor))
                             total_subactors += result.total_count
                             successful_actors += 1
                             
@@ -408,16 +596,55 @@ class GenerationService:
                     if not skip_on_error:
                         raise
         else:
-            # Level N->N+1: Process sub-actors (implementation similar to above)
-            # For brevity, implementing basic version - can be expanded
+            # Level N->N+1: expand every level-N leaf across all main actors in one parallel batch.
+            # Leaves are dicts inside parent_actors, so results are grafted back in place
+            leaves = []
+            for main_index, main_actor in enumerate(parent_actors):
+                frontier = [main_actor]
+                for _ in range(source_level):
+                    frontier = [sub for actor in frontier for sub in actor.get("sub_actors") or []]
+                for leaf in frontier:
+                    if leaf.get("sub_actors"):
+                        continue
+                    tasks.append(self._generate_subactors_for_actor_async(
+                        leaf, provider, model, num_subactors, target_level, main_index,
+                        system_context=system_context
+                    ))
+                    leaves.append(leaf)
+            
+            if tasks:
+                log_info(f"Starting parallel generation for {len(tasks)} level {source_level} actors")
+                results = await asyncio.gather(*tasks, return_exceptions=True)
+                
+                for leaf, result in zip(leaves, results):
+                    # Keep SubActor's keys whether or not the expansion succeeds
+                    leaf.setdefault("parameters", [])
+                    if isinstance(result, Exception):
+                        failed_actors += 1
+                        if not skip_on_error:
+                            raise result
+                        logger.warning("Skipping %s due to error", leaf['name'])
+                        leaf.setdefault("sub_actors", [])
+                        leaf.setdefault("sub_actors_count", 0)
+                        continue
+                    
+                    leaf["sub_actors"] = [
+                        sub_actor.model_dump(mode='python', warnings=False) for sub_actor in result.sub_actors
+                    ]
+                    leaf["sub_actors_count"] = result.total_count
+                    total_subactors += result.total_count
+                    successful_actors += 1
+            
             for main_actor in parent_actors:
-                enhanced_actors.append(EnhancedActor(**main_actor))
+                enhanced_actor = EnhancedActor.model_construct(**main_actor)
+                enhanced_actors.append(enhanced_actor)
+                output_actors.append(_actor_output(enhanced_actor))
         
         # Prepare output data
         cost_data = get_cost_session()
         output_data = {
             "metadata": {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": self._now_iso(),
                 "run_folder": run_folder.name,
                 "model_provider": provider,
                 "model_name": model,
@@ -428,7 +655,7 @@ class GenerationService:
                 "parallelization": {
                     "enabled": True,
                     "max_concurrent_threads": self.config.llm.max_concurrent_requests,
-                    "total_parallel_tasks": len(tasks) if 'tasks' in locals() else 0
+                    "total_parallel_tasks": len(tasks)
                 },
                 "generation_stats": {
                     "total_main_actors": len(enhanced_actors),
@@ -438,14 +665,14 @@ class GenerationService:
                 },
                 "cost_tracking": cost_data
             },
-            "actors": [actor.model_dump() for actor in enhanced_actors],
+            "actors": output_actors,
             "total_main_actors": len(enhanced_actors),
             "total_subactors": total_subactors,
             "level": target_level
         }
         
         # Save results
-        save_level_data(output_data, target_level, run_folder)
+        await save_level_data_async(output_data, target_level, run_folder)
         
         return enhanced_actors
 
@@ -457,7 +684,8 @@ class GenerationService:
         
         try:
             # Find latest deepest JSON file using the prepared script's function
-            init_logs_dir = get_latest_run_folder().parent if get_latest_run_folder() else None
+            latest_run_folder = get_latest_run_folder()
+            init_logs_dir = latest_run_folder.parent if latest_run_folder else None
             if not init_logs_dir:
                 self.update_parameter_status("failed", "No actor data found", 
                                            error="No previous runs found")
@@ -472,13 +700,33 @@ class GenerationService:
             
             self.update_parameter_status("running", "Loading actor data", 10)
             
-            # Load data using the prepared script's approach
-            with open(features_json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Read without blocking the loop; parsing a multi-MB file goes to a thread too
+            async with aiofiles.open(features_json_path, 'rb') as f:
+                raw = await f.read()
+            data = await asyncio.to_thread(orjson.loads, raw)
             
-            # Count total actors first using the prepared script's function
+            out_path = features_json_path.parent / (features_json_path.stem + "_with_params.json")
             actors = data.get('actors', [])
-            total_actors = sum(count_actors_recursively(actor) for actor in actors)
+            
+            # Results are streamed to disk per top-level actor, so an interrupted run can resume
+            writer = _StreamingParametersWriter(out_path, data, num_params, model)
+            recovered = await asyncio.to_thread(writer.open)
+            if recovered:
+                actors[:len(recovered)] = recovered
+                log_info(f"Resuming parameter generation", f"{len(recovered)} top-level actors already done")
+            pending = actors[len(recovered):]
+            
+            # Flatten the remaining trees - every actor is an independent LLM call
+            all_actors = []
+            owner = {}
+            remaining = []
+            for index, actor in enumerate(pending):
+                nodes = collect_actors_recursively(actor)
+                remaining.append(len(nodes))
+                for node in nodes:
+                    owner[id(node)] = index
+                all_actors.extend(nodes)
+            total_actors = len(all_actors)
             
             log_info(
                 "Parameter generation started",
@@ -487,26 +735,44 @@ class GenerationService:
             
             self.update_parameter_status("running", f"Processing {total_actors} actors", 20)
             
-            # Process each main actor using the prepared script's recursive function
             processed_actors = 0
-            for actor in actors:
-                # Use the prepared script's recursive function
-                await self._add_parameters_recursively_async(
-                    actor, num_params, provider, model
-                )
-                
-                processed_actors += count_actors_recursively(actor)
+            finished = asyncio.Queue()
+            
+            def on_actor_done(actor: Dict[str, Any]):
+                nonlocal processed_actors
+                processed_actors += 1
                 progress = 20 + (processed_actors * 70) / total_actors
-                self.update_parameter_status("running", 
-                                           f"Processed {processed_actors}/{total_actors} actors", 
-                                           progress)
+                self._report_parameter_progress(f"Processed {processed_actors}/{total_actors} actors",
+                                                progress, force=processed_actors == total_actors)
+                
+                index = owner[id(actor)]
+                remaining[index] -= 1
+                if remaining[index] == 0:
+                    finished.put_nowait(index)
             
-            # Save updated data
-            self.update_parameter_status("running", "Saving results", 90)
+            async def stream_finished_actors():
+                # Write top-level actors in their original order as their subtrees complete
+                done = set()
+                next_index = 0
+                while next_index < len(pending):
+                    done.add(await finished.get())
+                    while next_index in done:
+                        await asyncio.to_thread(writer.write_actor, pending[next_index])
+                        next_index += 1
             
-            out_path = features_json_path.parent / (features_json_path.stem + "_with_params.json")
-            with open(out_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            stream_task = asyncio.create_task(stream_finished_actors())
+            try:
+                await self._add_parameters_concurrently_async(
+                    all_actors, num_params, provider, model, on_actor_done
+                )
+                await stream_task
+            except BaseException:
+                stream_task.cancel()
+                writer.close()
+                raise
+            
+            self.update_parameter_status("running", "Saving results", 90)
+            await asyncio.to_thread(writer.finish)
             
             self.update_parameter_status("completed", 
                                        f"Successfully generated {num_params} parameters per actor", 
@@ -527,23 +793,120 @@ class GenerationService:
             )
             return None
 
+    async def _add_parameters_concurrently_async(self, actors: List[Dict[str, Any]], 
+                                                num_params: int, provider: str, model: str,
+                                                on_actor_done=None):
+        """
+        Add parameters to every actor in the flat list.
+        
+        Actors found in the parameter cache are filled in without an LLM call. The rest
+        are sent up to PARAMETER_BATCH_SIZE at a time in one prompt, and the batches run
+        concurrently. If a batch can't be parsed, or it leaves actors out, those actors
+        fall back to one call each. Actors with the same type and description share a
+        single generation, including with other runs in progress.
+        """
+        
+        # First use loads the embedding model and index - keep that off the event loop
+        cache = await asyncio.to_thread(get_parameter_cache)
+        if cache:
+            cached = await asyncio.to_thread(
+                lambda: [cache.get(actor, num_params, model) for actor in actors]
+            )
+            misses = []
+            for actor, params in zip(actors, cached):
+                if params is None:
+                    misses.append(actor)
+                    continue
+                actor['parameters'] = params
+                if on_actor_done:
+                    on_actor_done(actor)
+            if len(misses) < len(actors):
+                log_info(f"Reused cached parameters for {len(actors) - len(misses)}/{len(actors)} actors")
+            actors = misses
+        
+        # Single-flight: the first actor with a given key generates, duplicates wait for it
+        loop = asyncio.get_running_loop()
+        leaders = []
+        followers = []
+        owned = {}
+        for actor in actors:
+            key = _parameter_key(actor, num_params, model)
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._inflight[key] = loop.create_future()
+                owned[id(actor)] = (key, future)
+                leaders.append(actor)
+            else:
+                followers.append((actor, future))
+        
+        def actor_done(actor: Dict[str, Any]):
+            _, future = owned[id(actor)]
+            if not future.done():
+                future.set_result((str(actor.get('name')), actor['parameters']))
+            if on_actor_done:
+                on_actor_done(actor)
+        
+        async def follow(actor: Dict[str, Any], future: asyncio.Future):
+            # Same type and description, but possibly another name - retarget like cache hits
+            leader_name, params = await asyncio.shield(future)
+            params = retarget_parameters(params, leader_name, str(actor.get('name')))
+            actor['parameters'] = [dict(param) for param in params]
+            if on_actor_done:
+                on_actor_done(actor)
+        
+        async def add_parameters(actor: Dict[str, Any]):
+            actor['parameters'] = await call_llm_api_async(
+                generate_parameters_for_actor,
+                actor, num_params, provider, model
+            )
+            actor_done(actor)
+        
+        async def add_parameters_batch(batch: List[Dict[str, Any]]):
+            params_by_position = await call_llm_api_async(
+                generate_parameters_for_actor_batch,
+                batch, num_params, provider, model
+            ) or {}
+            
+            missing = []
+            for position, actor in enumerate(batch):
+                params = params_by_position.get(position)
+                if params is None:
+                    missing.append(actor)
+                    continue
+                actor['parameters'] = params
+                actor_done(actor)
+            
+            if missing:
+                log_warning(f"Batched parameter generation missed {len(missing)} actors, retrying them individually")
+                await asyncio.gather(*(add_parameters(actor) for actor in missing))
+        
+        batch_size = parameter_batch_size(provider, model, PARAMETER_BATCH_SIZE)
+        batches = [leaders[i:i + batch_size] for i in range(0, len(leaders), batch_size)]
+        try:
+            await asyncio.gather(
+                *(add_parameters_batch(batch) for batch in batches),
+                *(follow(actor, future) for actor, future in followers)
+            )
+        finally:
+            for key, future in owned.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("Duplicate actor's parameter generation failed"))
+                    # Only waiters elsewhere care about the failure - don't warn if there are none
+                    future.exception()
+                self._inflight.pop(key, None)
+        
+        if cache:
+            await asyncio.to_thread(
+                lambda: [cache.put(actor, num_params, model, actor.get('parameters')) for actor in actors]
+            )
+
     async def _add_parameters_recursively_async(self, actor: Dict[str, Any], 
                                                num_params: int, provider: str, model: str):
-        """Add parameters to this actor and all sub-actors recursively using async calls"""
+        """Add parameters to this actor and all sub-actors using concurrent async calls"""
         
-        # Generate parameters for this actor using the prepared script's function
-        actor_params = await call_llm_api_async(
-            generate_parameters_for_actor,
-            actor, num_params, provider, model
+        await self._add_parameters_concurrently_async(
+            collect_actors_recursively(actor), num_params, provider, model
         )
-        actor['parameters'] = actor_params
-        
-        # Recursively process sub-actors
-        if 'sub_actors' in actor and isinstance(actor['sub_actors'], list):
-            for sub_actor in actor['sub_actors']:
-                await self._add_parameters_recursively_async(
-                    sub_actor, num_params, provider, model
-                )
 
 
 # Global service instance
@@ -3,131 +3,228 @@ Utility functions for the World Model backend.
 Common functions for logging, file management, and error handling.
 """
 
-import json
+import os
+import re
+import sys
 import traceback
 import asyncio
+import atexit
+import logging
+import logging.handlers
+import queue
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Union
+
+import aiofiles
+import aiofiles.os
+import orjson
+
 from .config import get_config
 from .models import GenerationOutput
 
 
 # ==================== LOGGING FUNCTIONS ====================
 
-def log_error(error_type: str, error_message: str, details: Optional[str] = None, 
-              exception: Optional[Exception] = None) -> None:
-    """Enhanced error logging function for terminal output with red cross emoji"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    print(f"\n{'='*60}")
-    print(f"❌ ERROR [{error_type}] - {timestamp}")
-    print(f"{'='*60}")
-    print(f"Message: {error_message}")
+_SEP = "=" * 60
+
+
+def _env_log_level() -> int:
+    """WM_LOG_LEVEL as a number or level name (e.g. 30 or WARNING); defaults to INFO"""
+    value = os.environ.get("WM_LOG_LEVEL", "").strip()
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper()) if value else logging.INFO
+    return level if isinstance(level, int) else logging.INFO
+
+
+# Messages below this level are dropped before any formatting work
+_LOG_LEVEL = _env_log_level()
+
+
+def _log(header: str, message: str, details: Optional[str] = None,
+         exception: Optional[Exception] = None) -> None:
+    """Build one log block and emit it with a single stdout write"""
+    timestamp = datetime.now().isoformat(" ", "seconds")
+    parts = [f"\n{_SEP}\n{header} - {timestamp}\n{_SEP}\nMessage: {message}\n"]
     
     if details:
-        print(f"Details: {details}")
+        parts.append(f"Details: {details}\n")
     
     if exception:
-        print(f"Exception Type: {type(exception).__name__}")
-        print(f"Exception Message: {str(exception)}")
-        print(f"\nFull Traceback:")
-        traceback.print_exc()
+        parts.append(
+            f"Exception Type: {type(exception).__name__}\n"
+            f"Exception Message: {str(exception)}\n"
+            f"\nFull Traceback:\n{traceback.format_exc()}"
+        )
     
-    print(f"{'='*60}\n")
+    parts.append(f"{_SEP}\n\n")
+    sys.stdout.write("".join(parts))
+
+
+def log_error(error_type: str, error_message: str, details: Optional[str] = None, 
+              exception: Optional[Exception] = None) -> None:
+    """Enhanced error logging function for terminal output with red cross emoji"""
+    if _LOG_LEVEL > logging.ERROR:
+        return
+    _log(f"❌ ERROR [{error_type}]", error_message, details, exception)
 
 
 def log_success(message: str, details: Optional[str] = None) -> None:
     """Success logging function with green checkmark emoji"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    print(f"\n{'='*60}")
-    print(f"✅ SUCCESS - {timestamp}")
-    print(f"{'='*60}")
-    print(f"Message: {message}")
-    
-    if details:
-        print(f"Details: {details}")
-    
-    print(f"{'='*60}\n")
+    if _LOG_LEVEL > logging.INFO:
+        return
+    _log("✅ SUCCESS", message, details)
 
 
 def log_info(message: str, details: Optional[str] = None) -> None:
     """Info logging function with blue info emoji"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    print(f"\n{'='*60}")
-    print(f"ℹ️  INFO - {timestamp}")
-    print(f"{'='*60}")
-    print(f"Message: {message}")
-    
-    if details:
-        print(f"Details: {details}")
-    
-    print(f"{'='*60}\n")
+    if _LOG_LEVEL > logging.INFO:
+        return
+    _log("ℹ️  INFO", message, details)
 
 
 def log_warning(message: str, details: Optional[str] = None) -> None:
     """Warning logging function with yellow warning emoji"""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    print(f"\n{'='*60}")
-    print(f"⚠️  WARNING - {timestamp}")
-    print(f"{'='*60}")
-    print(f"Message: {message}")
+    if _LOG_LEVEL > logging.WARNING:
+        return
+    _log("⚠️  WARNING", message, details)
+
+
+# ==================== QUEUED LOGGING ====================
+
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def get_queued_logger(name: str) -> logging.Logger:
+    """
+    Logger for hot paths (per-actor / per-request messages inside async fan-outs).
     
-    if details:
-        print(f"Details: {details}")
+    Records are only enqueued by the caller; formatting and terminal I/O happen on a
+    background QueueListener thread, so the event loop never blocks on stdout.
+    """
+    global _queue_listener
+    if _queue_listener is None:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter(
+            "%(levelname)s - %(asctime)s - %(message)s", datefmt="%Y-%m-%d %H:%M:%S"
+        ))
+        _queue_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+        _queue_listener.start()
+        atexit.register(_queue_listener.stop)
+        
+        root = logging.getLogger("worldmodel")
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        root.setLevel(_LOG_LEVEL)
+        root.propagate = False
     
-    print(f"{'='*60}\n")
+    return logging.getLogger(f"worldmodel.{name}")
 
 
 # ==================== FILE MANAGEMENT ====================
 
+_BACKEND_DIR = Path(__file__).resolve().parent
+
+
+@lru_cache(maxsize=8)
+def _base_logs_dir(relative_dir: str) -> Path:
+    """Absolute logs directory for a config.base_logs_dir value (relative to the backend dir)"""
+    return _BACKEND_DIR / relative_dir
+
+
 def get_run_folder_path() -> Path:
     """Get the path to the most recent run folder or create a new one"""
-    config = get_config()
-    
-    # Get the backend directory - walk up from this file
-    backend_dir = Path(__file__).parent
-    base_logs_dir = backend_dir / config.base_logs_dir
+    base_logs_dir = _base_logs_dir(get_config().base_logs_dir)
     base_logs_dir.mkdir(parents=True, exist_ok=True)
     
     # Create date-based subfolder with running integer
     current_date = datetime.now().strftime("%Y-%m-%d")
+    prefix = f"run_{current_date}_"
     
-    # Find the next available run number for today
-    run_number = 1
     while True:
-        subfolder_name = f"run_{current_date}_{run_number}"
-        subfolder_path = base_logs_dir / subfolder_name
-        
-        if not subfolder_path.exists():
-            subfolder_path.mkdir(parents=True, exist_ok=True)
-            return subfolder_path
+        # Next run number for today: one directory scan instead of probing run_1, run_2, ...
+        with os.scandir(base_logs_dir) as entries:
+            run_number = max(
+                (int(entry.name[len(prefix):]) for entry in entries
+                 if entry.name.startswith(prefix) and entry.name[len(prefix):].isdigit()),
+                default=0
+            ) + 1
         
-        run_number += 1
+        subfolder_path = base_logs_dir / f"{prefix}{run_number}"
+        try:
+            subfolder_path.mkdir()
+        except FileExistsError:
+            # Another worker took this number between the scan and mkdir - rescan
+            continue
+        clear_latest_run_folder_cache()
+        return subfolder_path
+
+
+# How long get_latest_run_folder may reuse its last directory scan
+LATEST_RUN_FOLDER_TTL = 5.0
 
 
 def get_latest_run_folder() -> Optional[Path]:
-    """Get the path to the most recent run folder"""
-    config = get_config()
-    backend_dir = Path(__file__).parent
-    base_logs_dir = backend_dir / config.base_logs_dir
+    """
+    Get the path to the most recent run folder.
+    Scans are memoized for up to LATEST_RUN_FOLDER_TTL seconds (several endpoints call this
+    per request); creating a run folder clears the memo.
+    """
+    return _scan_latest_run_folder(int(time.monotonic() // LATEST_RUN_FOLDER_TTL))
+
+
+def clear_latest_run_folder_cache() -> None:
+    """Forget the memoized latest run folder (call after creating a new run folder)"""
+    _scan_latest_run_folder.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def _scan_latest_run_folder(ttl_bucket: int) -> Optional[Path]:
+    """Directory scan behind get_latest_run_folder; ttl_bucket only keys the cache"""
+    base_logs_dir = _base_logs_dir(get_config().base_logs_dir)
     
     if not base_logs_dir.exists():
         return None
     
-    # Find the most recent run folder
-    run_folders = [d for d in base_logs_dir.iterdir() 
-                   if d.is_dir() and d.name.startswith("run_")]
-    
-    if not run_folders:
-        return None
+    return _most_recent_run_folder(base_logs_dir)
+
+
+def _most_recent_run_folder(logs_dir: Path) -> Optional[Path]:
+    """Most recently created run_* folder in logs_dir (max over one scandir, no sort)"""
+    with os.scandir(logs_dir) as entries:
+        latest = max(
+            (entry for entry in entries
+             if entry.name.startswith("run_") and entry.is_dir(follow_symlinks=False)),
+            key=lambda entry: entry.stat().st_ctime,
+            default=None
+        )
+    return Path(latest.path) if latest else None
+
+
+_LEVEL_FILE_PATTERN = re.compile(r"Features_level_(\d+)\.json$")
+
+
+def _scan_level_files(run_folder: Path) -> List[Tuple[int, os.DirEntry]]:
+    """
+    Features_level_N.json entries of a run folder as (N, entry), from level 0 up to the first
+    missing level - one directory scan instead of an exists() probe per level.
+    """
+    with os.scandir(run_folder) as entries:
+        by_level = {
+            int(match.group(1)): entry
+            for entry in entries
+            if (match := _LEVEL_FILE_PATTERN.match(entry.name))
+        }
     
-    # Sort by creation time (most recent first)
-    run_folders.sort(key=lambda x: x.stat().st_ctime, reverse=True)
-    return run_folders[0]
+    level_files = []
+    while len(level_files) in by_level:
+        level_files.append((len(level_files), by_level[len(level_files)]))
+    return level_files
 
 
 def find_latest_features_json(init_logs_dir: Path) -> Optional[Path]:
@@ -135,27 +232,13 @@ def find_latest_features_json(init_logs_dir: Path) -> Optional[Path]:
     if not init_logs_dir.exists():
         return None
     
-    run_folders = [d for d in init_logs_dir.iterdir() 
-                   if d.is_dir() and d.name.startswith("run_")]
-    
-    if not run_folders:
+    run_folder = _most_recent_run_folder(init_logs_dir)
+    if not run_folder:
         return None
     
-    run_folders.sort(key=lambda x: x.stat().st_ctime, reverse=True)
-    run_folder = run_folders[0]
-    
     # Find the deepest Features_level_N.json
-    level = 0
-    latest_file = None
-    
-    while True:
-        file_path = run_folder / f"Features_level_{level}.json"
-        if not file_path.exists():
-            break
-        latest_file = file_path
-        level += 1
-    
-    return latest_file
+    level_files = _scan_level_files(run_folder)
+    return run_folder / level_files[-1][1].name if level_files else None
 
 
 def save_level_data(data: Dict[str, Any], level: int, run_folder: Path) -> Optional[str]:
@@ -164,8 +247,16 @@ def save_level_data(data: Dict[str, Any], level: int, run_folder: Path) -> Optio
         filename = f"Features_level_{level}.json"
         filepath = run_folder / filename
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # orjson writes UTF-8 bytes directly; one buffered write for the whole file.
+        # Serialized first, then written to a temp file and renamed over the target,
+        # so readers never see a partial file and a bad payload leaves nothing behind
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        tmp_path = filepath.with_suffix(".json.tmp")
+        with open(tmp_path, 'wb', buffering=64 * 1024) as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
         
         log_success(
             f"Level {level} JSON saved successfully",
@@ -197,8 +288,9 @@ def load_level_data(level: int, run_folder: Path) -> Optional[Dict[str, Any]]:
             )
             return None
         
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # Unbuffered: the whole file is read in one call, no point copying through a buffer
+        with open(filepath, 'rb', buffering=0) as f:
+            data = orjson.loads(f.read())
         
         return data
         
@@ -212,35 +304,116 @@ def load_level_data(level: int, run_folder: Path) -> Optional[Dict[str, Any]]:
         return None
 
 
+async def save_level_data_async(data: Dict[str, Any], level: int, run_folder: Path) -> Optional[str]:
+    """save_level_data for async code paths - the file write doesn't block the event loop"""
+    filepath = run_folder / f"Features_level_{level}.json"
+    try:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+        # Same temp file + fsync + rename as save_level_data
+        tmp_path = filepath.with_suffix(".json.tmp")
+        async with aiofiles.open(tmp_path, 'wb') as f:
+            await f.write(payload)
+            await f.flush()
+            await asyncio.to_thread(os.fsync, f.fileno())
+        await aiofiles.os.replace(tmp_path, filepath)
+        
+        log_success(
+            f"Level {level} JSON saved successfully",
+            f"File: {filepath}\nRun folder: {run_folder.name}"
+        )
+        return str(filepath)
+        
+    except Exception as e:
+        log_error(
+            error_type="FILE_SAVE_ERROR",
+            error_message=f"Failed to save level {level} data to JSON file",
+            details=f"Target file: {filepath}",
+            exception=e
+        )
+        return None
+
+
+async def load_level_data_async(level: int, run_folder: Path) -> Optional[Dict[str, Any]]:
+    """load_level_data for async code paths - the file read doesn't block the event loop"""
+    filepath = run_folder / f"Features_level_{level}.json"
+    try:
+        async with aiofiles.open(filepath, 'rb') as f:
+            return orjson.loads(await f.read())
+        
+    except FileNotFoundError:
+        log_error(
+            error_type="FILE_NOT_FOUND",
+            error_message=f"Level {level} file not found",
+            details=f"Expected file: {filepath}"
+        )
+        return None
+    except Exception as e:
+        log_error(
+            error_type="FILE_LOAD_ERROR",
+            error_message=f"Failed to load level {level} data from JSON file",
+            details=f"Source file: {filepath}",
+            exception=e
+        )
+        return None
+
+
+def load_level_data_bytes(level: Union[int, str], run_folder: Path) -> Optional[bytes]:
+    """
+    Raw bytes of Features_level_{level}.json, or None if it doesn't exist.
+    For callers that only forward the file (e.g. an API response) - skips parsing and
+    re-serializing. level may carry a suffix, e.g. "3_with_params".
+    """
+    try:
+        return (run_folder / f"Features_level_{level}.json").read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+# str(run folder) -> (level file fingerprint, run info); least recently used first
+_RUN_INFO_CACHE: "OrderedDict[str, Tuple[tuple, Dict[str, Any]]]" = OrderedDict()
+RUN_INFO_CACHE_SIZE = 256
+
+
 def get_run_info(run_folder: Path) -> Dict[str, Any]:
-    """Get information about a run folder"""
+    """
+    Get information about a run folder.
+    Cached per folder on each level file's (name, mtime, size), taken from the same scan -
+    level files may be rewritten in place, which doesn't touch the folder's mtime.
+    """
     if not run_folder.exists():
         return {"status": "not_found"}
     
     try:
-        level_files = []
-        level = 0
+        level_stats = [(level, entry.name, entry.stat()) for level, entry in _scan_level_files(run_folder)]
+        fingerprint = tuple((name, stat.st_mtime_ns, stat.st_size) for _, name, stat in level_stats)
         
-        while True:
-            file_path = run_folder / f"Features_level_{level}.json"
-            if not file_path.exists():
-                break
-            
-            stat = file_path.stat()
-            level_files.append({
+        key = str(run_folder)
+        cached = _RUN_INFO_CACHE.get(key)
+        if cached and cached[0] == fingerprint:
+            _RUN_INFO_CACHE.move_to_end(key)
+            return cached[1]
+        
+        level_files = [
+            {
                 "level": level,
-                "file": file_path.name,
+                "file": name,
                 "size": stat.st_size,
                 "modified": stat.st_mtime
-            })
-            level += 1
+            }
+            for level, name, stat in level_stats
+        ]
         
-        return {
+        info = {
             "status": "found" if level_files else "empty",
             "run_folder": run_folder.name,
             "level_files": level_files,
             "total_levels": len(level_files)
         }
+        _RUN_INFO_CACHE[key] = (fingerprint, info)
+        _RUN_INFO_CACHE.move_to_end(key)
+        if len(_RUN_INFO_CACHE) > RUN_INFO_CACHE_SIZE:
+            _RUN_INFO_CACHE.popitem(last=False)
+        return info
         
     except Exception as e:
         log_error(
@@ -254,59 +427,180 @@ def get_run_info(run_folder: Path) -> Dict[str, Any]:
 
 # ==================== ASYNC UTILITIES ====================
 
+def _make_rate_limiter(requests_per_minute: int):
+    """Token bucket for LLM requests, or None if disabled / aiolimiter isn't installed"""
+    if requests_per_minute <= 0:
+        return None
+    try:
+        from aiolimiter import AsyncLimiter
+    except ImportError:
+        log_warning("aiolimiter not installed", "LLM requests will not be rate limited")
+        return None
+    return AsyncLimiter(max_rate=requests_per_minute, time_period=60)
+
+
+# The one gate for every LLM call: at most llm.max_concurrent_requests in flight and
+# llm.requests_per_minute started per minute, across all callers. Both are tied to an
+# event loop, so they're (re)created lazily for the running loop
+_llm_loop: Optional[asyncio.AbstractEventLoop] = None
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+_llm_bucket = None
+# Dedicated threads for the blocking SDK calls, sized to the semaphore so admitted calls never
+# queue behind each other (or behind other users of the loop's default executor)
+_llm_executor: Optional[ThreadPoolExecutor] = None
+
+
 async def call_llm_api_async(llm_func, *args, **kwargs):
-    """Generic async wrapper for LLM API calls"""
-    semaphore = asyncio.Semaphore(get_config().llm.max_concurrent_requests)
+    """
+    Generic async wrapper for LLM API calls, bounded by the shared concurrency limit
+    and requests-per-minute bucket (see config.llm).
+    """
+    global _llm_loop, _llm_semaphore, _llm_bucket, _llm_executor
+    llm_settings = get_config().llm
+    loop = asyncio.get_running_loop()
+    if _llm_loop is not loop:
+        _llm_loop = loop
+        _llm_semaphore = asyncio.Semaphore(llm_settings.max_concurrent_requests)
+        _llm_bucket = _make_rate_limiter(llm_settings.requests_per_minute)
+    if _llm_executor is None:
+        _llm_executor = ThreadPoolExecutor(
+            max_workers=llm_settings.max_concurrent_requests, thread_name_prefix="llm-api"
+        )
     
-    async with semaphore:
-        # Run the synchronous LLM API call in a thread pool
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, lambda: llm_func(*args, **kwargs))
+    async with _llm_semaphore:
+        if _llm_bucket is not None:
+            await _llm_bucket.acquire()
+        # Run the synchronous LLM API call in the LLM thread pool
+        return await loop.run_in_executor(_llm_executor, partial(llm_func, *args, **kwargs))
+
+
+_TRUNC_NEEDLES = ("Unterminated string", "Expecting ',' delimiter")
+# Truncation markers only show up at the end - don't scan the whole (possibly huge) response
+_TRUNC_TAIL_CHARS = 512
 
 
 def handle_json_parsing_error(response: str, context: str) -> None:
     """Handle JSON parsing errors with context"""
-    if "Unterminated string" in str(response) or "Expecting ',' delimiter" in str(response):
+    response = str(response)
+    tail = response[-_TRUNC_TAIL_CHARS:]
+    details = f"Context: {context}\nResponse length: {len(response)} chars\nResponse tail: {tail[-200:]!r}"
+    
+    if any(needle in tail for needle in _TRUNC_NEEDLES):
         log_error(
             error_type="JSON_TRUNCATION_ERROR",
             error_message="LLM response appears to be truncated due to token limit",
-            details=f"Context: {context}\nResponse length: {len(response)} chars"
+            details=details
         )
     else:
         log_error(
             error_type="JSON_PARSE_ERROR",
             error_message="LLM did not return valid JSON",
-            details=f"Context: {context}\nResponse length: {len(response)} chars"
+            details=details
         )
 
 
+def parse_llm_json(response: str, context: str = "") -> Any:
+    """
+    Parse a JSON response from an LLM, repairing it if it's malformed.
+    
+    orjson handles the common (valid) case. On failure, json_repair (optional dependency)
+    closes truncated brackets/strings - usually the response hit max_tokens - so the parsed
+    prefix is kept instead of losing the whole generation. Raises json.JSONDecodeError if
+    the response can't be recovered.
+    """
+    try:
+        return orjson.loads(response)
+    except orjson.JSONDecodeError as e:
+        try:
+            import json_repair
+        except ImportError:
+            raise e
+        repaired = json_repair.loads(response)
+        # json_repair returns "" when there is nothing to salvage
+        if not isinstance(repaired, (dict, list)) or not repaired:
+            raise e
+        log_warning("Repaired malformed JSON from LLM", context or None)
+        return repaired
+
+
+def parse_llm_actor_list(response: str, list_key: str, context: str = "",
+                         required_fields: Tuple[str, ...] = ('name', 'description', 'type'),
+                         **defaults: Any) -> Dict[str, Any]:
+    """
+    parse_llm_json for a response holding a list of actors under list_key.
+    
+    A response that needed repairing was usually cut off at max_tokens: its last entries are
+    partial and any top-level fields after the list are lost. Trailing entries missing one of
+    required_fields are dropped and defaults (e.g. parent_actor=...) fill in the missing
+    top-level fields, so the surviving actors still validate.
+    """
+    try:
+        return orjson.loads(response)
+    except orjson.JSONDecodeError as e:
+        error = e
+    
+    data = parse_llm_json(response, context)
+    entries = data.get(list_key) if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        raise error
+    while entries and not (isinstance(entries[-1], dict)
+                           and all(entries[-1].get(field) for field in required_fields)):
+        entries.pop()
+    if not entries:
+        raise error
+    
+    for key, value in defaults.items():
+        data.setdefault(key, value)
+    return data
+
+
+# (casefolded substring, error type) - first match wins
+_API_ERROR_RULES = (
+    ("api key", "API_KEY_ERROR"),
+    ("anthropic_api_key", "API_KEY_ERROR"),
+    ("openai_api_key", "API_KEY_ERROR"),
+    ("quota", "API_QUOTA_ERROR"),
+    ("limit", "API_QUOTA_ERROR"),
+    ("timeout", "API_TIMEOUT_ERROR"),
+    ("network", "API_NETWORK_ERROR"),
+    ("connection", "API_NETWORK_ERROR"),
+)
+
+
 def handle_api_error(error: Exception, provider: str, model: str) -> str:
     """Handle API errors and return appropriate error type"""
-    error_str = str(error)
+    error_str = str(error).casefold()
     
-    if "API key" in error_str or "ANTHROPIC_API_KEY" in error_str or "OPENAI_API_KEY" in error_str:
-        return "API_KEY_ERROR"
-    elif "quota" in error_str.lower() or "limit" in error_str.lower():
-        return "API_QUOTA_ERROR"
-    elif "timeout" in error_str.lower():
-        return "API_TIMEOUT_ERROR"
-    elif "network" in error_str.lower() or "connection" in error_str.lower():
-        return "API_NETWORK_ERROR"
-    else:
-        return "GENERAL_API_ERROR"
+    for needle, error_type in _API_ERROR_RULES:
+        if needle in error_str:
+            return error_type
+    return "GENERAL_API_ERROR"
 
 
 # ==================== VALIDATION UTILITIES ====================
 
 def validate_actor_data(actor_data: Dict[str, Any]) -> bool:
-    """Validate actor data structure"""
-    required_fields = ['name', 'description', 'type']
-    return all(field in actor_data and actor_data[field] for field in required_fields)
+    """Validate actor data structure (name, description and type must be present and non-empty)"""
+    return bool(actor_data.get('name') and actor_data.get('description') and actor_data.get('type'))
+
+
+def validate_actor_data_batch(actors: List[Dict[str, Any]]) -> List[bool]:
+    """validate_actor_data for a list of actors"""
+    return [validate_actor_data(actor) for actor in actors]
+
+
+# (request field, GenerationLimits min attribute, GenerationLimits max attribute)
+_NUMERIC_FIELDS = (
+    ('num_actors', 'min_actors', 'max_actors'),
+    ('num_subactors', 'min_subactors', 'max_subactors'),
+    ('target_depth', 'min_depth', 'max_depth'),
+    ('num_params', 'min_params', 'max_params'),
+)
 
 
 def validate_generation_request(request_data: Dict[str, Any]) -> List[str]:
     """Validate generation request data"""
-    config = get_config()
+    limits = get_config().limits
     errors = []
     
     # Validate provider
@@ -320,29 +614,17 @@ def validate_generation_request(request_data: Dict[str, Any]) -> List[str]:
         errors.append("Model is required")
     
     # Validate numeric parameters
-    if 'num_actors' in request_data:
-        if not isinstance(request_data['num_actors'], int):
-            errors.append("num_actors must be an integer")
-        elif not (config.limits.min_actors <= request_data['num_actors'] <= config.limits.max_actors):
-            errors.append(f"num_actors must be between {config.limits.min_actors} and {config.limits.max_actors}")
-    
-    if 'num_subactors' in request_data:
-        if not isinstance(request_data['num_subactors'], int):
-            errors.append("num_subactors must be an integer")
-        elif not (config.limits.min_subactors <= request_data['num_subactors'] <= config.limits.max_subactors):
-            errors.append(f"num_subactors must be between {config.limits.min_subactors} and {config.limits.max_subactors}")
-    
-    if 'target_depth' in request_data:
-        if not isinstance(request_data['target_depth'], int):
-            errors.append("target_depth must be an integer")
-        elif not (config.limits.min_depth <= request_data['target_depth'] <= config.limits.max_depth):
-            errors.append(f"target_depth must be between {config.limits.min_depth} and {config.limits.max_depth}")
-    
-    if 'num_params' in request_data:
-        if not isinstance(request_data['num_params'], int):
-            errors.append("num_params must be an integer")
-        elif not (config.limits.min_params <= request_data['num_params'] <= config.limits.max_params):
-            errors.append(f"num_params must be between {config.limits.min_params} and {config.limits.max_params}")
+    for field, min_attr, max_attr in _NUMERIC_FIELDS:
+        if field not in request_data:
+            continue
+        value = request_data[field]
+        # bool is an int subclass - reject it along with floats/strings
+        if type(value) is not int:
+            errors.append(f"{field} must be an integer")
+            continue
+        low, high = getattr(limits, min_attr), getattr(limits, max_attr)
+        if not (low <= value <= high):
+            errors.append(f"{field} must be between {low} and {high}")
     
     return errors
 
@@ -351,31 +633,25 @@ def validate_generation_request(request_data: Dict[str, Any]) -> List[str]:
 
 def format_duration(start_time: datetime, end_time: datetime) -> str:
     """Format duration between two datetime objects"""
-    duration = end_time - start_time
-    total_seconds = int(duration.total_seconds())
+    total_seconds = int((end_time - start_time).total_seconds())
     
     if total_seconds < 60:
         return f"{total_seconds}s"
-    elif total_seconds < 3600:
-        minutes = total_seconds // 60
-        seconds = total_seconds % 60
-        return f"{minutes}m {seconds}s"
-    else:
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        return f"{hours}h {minutes}m"
+    hours, remainder = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours}h {minutes}m" if hours else f"{minutes}m {seconds}s"
+
+
+# Indexed by (size_bytes.bit_length() - 1) // 10, i.e. the power of 1024
+_SIZE_UNITS = (("B", 1), ("KB", 1024), ("MB", 1024 ** 2), ("GB", 1024 ** 3))
 
 
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human-readable format"""
     if size_bytes < 1024:
         return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.1f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.1f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+    unit, divisor = _SIZE_UNITS[min((size_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)]
+    return f"{size_bytes / divisor:.1f} {unit}"
 
 
 # Export commonly used functions
@@ -384,16 +660,24 @@ __all__ = [
     'log_success',
     'log_info',
     'log_warning',
+    'get_queued_logger',
     'get_run_folder_path',
     'get_latest_run_folder',
+    'clear_latest_run_folder_cache',
     'find_latest_features_json',
     'save_level_data',
     'load_level_data',
+    'save_level_data_async',
+    'load_level_data_async',
+    'load_level_data_bytes',
     'get_run_info',
     'call_llm_api_async',
     'handle_json_parsing_error',
+    'parse_llm_json',
+    'parse_llm_actor_list',
     'handle_api_error',
     'validate_actor_data',
+    'validate_actor_data_batch',
     'validate_generation_request',
     'format_duration',
     'format_file_size'
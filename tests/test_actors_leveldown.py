@@ -0,0 +1,169 @@
+import asyncio
+import os
+import re
+import sys
+import threading
+import time
+
+import orjson
+import pytest
+
+# Add the parent of 'worldmodel' to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from worldmodel.backend.config import get_config
+from worldmodel.backend.routes.initializationroute import actors_leveldown
+from worldmodel.backend.routes.initializationroute.actors_leveldown import generate_actor_leveldown_async
+
+MODEL = "claude-3-5-sonnet-latest"
+PARENT_PATTERN = re.compile(r'Use "(.+?)" as the value of every "parent_actor" field')
+
+
+@pytest.fixture
+def fake_llm(monkeypatch, tmp_path):
+    """Points the level-down run at tmp_path and answers sub-actor prompts with two sub-actors each"""
+    calls = []
+    failing = set()
+    lock = threading.Lock()
+    in_flight = [0, 0]  # current, peak
+
+    def call_llm_api(prompt, **kwargs):
+        parent = PARENT_PATTERN.search(prompt).group(1)
+        with lock:
+            calls.append(parent)
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+        if parent in failing:
+            raise RuntimeError(f"LLM failed for {parent}")
+        return orjson.dumps({
+            "sub_actors": [
+                {"name": f"{parent} Sub {i}", "description": f"Part {i} of {parent}.",
+                 "type": "Institution", "parent_actor": parent}
+                for i in range(2)
+            ],
+            "parent_actor": parent
+        }).decode()
+
+    monkeypatch.setattr(actors_leveldown, "call_llm_api", call_llm_api)
+    monkeypatch.setattr(actors_leveldown, "_get_latest_run_folder", lambda: tmp_path)
+    return calls, failing, in_flight
+
+
+def _write_level(run_folder, level, actors):
+    (run_folder / f"Features_level_{level}.json").write_bytes(orjson.dumps({
+        "metadata": {"level": level},
+        "actors": actors
+    }))
+
+
+def _read_level(run_folder, level):
+    return orjson.loads((run_folder / f"Features_level_{level}.json").read_bytes())
+
+
+def _actor(name):
+    return {"name": name, "description": f"{name} description.", "type": "Country"}
+
+
+def _leveldown(**kwargs):
+    return asyncio.run(generate_actor_leveldown_async(
+        model_provider="anthropic", model_name=MODEL, num_subactors_per_actor=2, **kwargs
+    ))
+
+
+def test_generates_every_level_down_to_target(tmp_path, fake_llm):
+    calls, _, _ = fake_llm
+    _write_level(tmp_path, 0, [_actor("France"), _actor("Japan")])
+
+    result = _leveldown(target_level=2)
+
+    assert result == tmp_path / "Features_level_2.json"
+    assert len(calls) == 2 + 4
+    level_1 = _read_level(tmp_path, 1)
+    assert level_1["metadata"]["generation_stats"]["total_subactors"] == 4
+    assert all(sub["sub_actors"] == [] for actor in level_1["actors"] for sub in actor["sub_actors"])
+    france = _read_level(tmp_path, 2)["actors"][0]
+    assert [sub["sub_actors_count"] for sub in france["sub_actors"]] == [2, 2]
+    assert france["sub_actors"][1]["sub_actors"][0]["parent_actor"] == "France Sub 1"
+
+
+def test_resumes_from_deepest_existing_level(tmp_path, fake_llm):
+    calls, _, _ = fake_llm
+    _write_level(tmp_path, 0, [_actor("France")])
+    france = {**_actor("France"), "sub_actors_count": 1, "sub_actors": [
+        {**_actor("Paris"), "parent_actor": "France", "sub_actors": [], "sub_actors_count": 0}
+    ]}
+    _write_level(tmp_path, 1, [france])
+
+    result = _leveldown(target_level=2)
+
+    assert result == tmp_path / "Features_level_2.json"
+    assert calls == ["Paris"]
+    (france,) = _read_level(tmp_path, 2)["actors"]
+    assert france["sub_actors"][0]["sub_actors_count"] == 2
+
+
+def test_existing_target_level_is_reused(tmp_path, fake_llm):
+    calls, _, _ = fake_llm
+    _write_level(tmp_path, 0, [_actor("France")])
+    _write_level(tmp_path, 1, [_actor("France")])
+
+    assert _leveldown(target_level=1) == tmp_path / "Features_level_1.json"
+    assert calls == []
+
+
+def test_identical_actors_share_one_call(tmp_path, fake_llm):
+    calls, _, _ = fake_llm
+    _write_level(tmp_path, 0, [_actor("France"), _actor("France")])
+
+    _leveldown(target_level=1)
+
+    assert calls == ["France"]
+    first, second = _read_level(tmp_path, 1)["actors"]
+    assert first["sub_actors"] == second["sub_actors"]
+
+
+def test_failed_actor_is_skipped_with_skip_on_error(tmp_path, fake_llm):
+    _, failing, _ = fake_llm
+    failing.add("Japan")
+    _write_level(tmp_path, 0, [_actor("France"), _actor("Japan")])
+
+    _leveldown(target_level=1, skip_on_error=True)
+
+    france, japan = _read_level(tmp_path, 1)["actors"]
+    assert france["sub_actors_count"] == 2
+    assert japan["sub_actors"] == [] and japan["sub_actors_count"] == 0
+
+
+def test_failure_propagates_without_skip_on_error(tmp_path, fake_llm):
+    _, failing, _ = fake_llm
+    failing.add("Japan")
+    _write_level(tmp_path, 0, [_actor("France"), _actor("Japan")])
+
+    with pytest.raises(RuntimeError, match="Japan"):
+        _leveldown(target_level=2, skip_on_error=False)
+
+    assert not (tmp_path / "Features_level_1.json").exists()
+
+
+def test_concurrency_defaults_to_config(tmp_path, fake_llm, monkeypatch):
+    _, _, in_flight = fake_llm
+    monkeypatch.setattr(get_config().llm, "max_concurrent_requests", 1)
+    _write_level(tmp_path, 0, [_actor(f"Country {i}") for i in range(4)])
+
+    _leveldown(target_level=1)
+
+    assert in_flight[1] == 1
+
+
+def test_truncated_response_keeps_complete_sub_actors(monkeypatch):
+    pytest.importorskip("json_repair")
+    truncated = ('{"sub_actors": [{"name": "Paris", "description": "Capital.", "type": "City", '
+                 '"parent_actor": "France"}, {"name": "Lyon", "descri')
+    monkeypatch.setattr(actors_leveldown, "call_llm_api", lambda prompt, **kwargs: truncated)
+
+    sub_list = actors_leveldown.generate_subactors_for_actor(_actor("France"), "anthropic", MODEL, 2, 1)
+
+    assert [sub.name for sub in sub_list.sub_actors] == ["Paris"]
+    assert sub_list.parent_actor == "France" and sub_list.total_count == 1
@@ -0,0 +1,252 @@
+import asyncio
+import json
+import os
+import re
+import sys
+
+import orjson
+import pytest
+
+# Add the parent of 'worldmodel' to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from worldmodel.backend import services
+from worldmodel.backend.services import GenerationService, _StreamingParametersWriter
+
+ACTOR_KEYS = {"name", "description", "type", "sub_actors", "sub_actors_count", "parameters"}
+PARENT_PATTERN = re.compile(r'Use "(.+?)" as the value of every "parent_actor" field')
+LEVEL_0_RESPONSE = orjson.dumps({"actors": [
+    {"name": "France", "description": "A large European economy.", "type": "Country"},
+    {"name": "Japan", "description": "A large Asian economy.", "type": "Country"}
+]}).decode()
+
+
+def _subactors_response(parent: str, count: int = 2) -> str:
+    return orjson.dumps({
+        "sub_actors": [
+            {"name": f"{parent} Sub {i}", "description": f"Part {i} of {parent}.",
+             "type": "Institution", "parent_actor": parent}
+            for i in range(count)
+        ],
+        "parent_actor": parent
+    }).decode()
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Stand-in for the LLM: answers actor prompts, fails for parents named in `failing` (None: level 0)"""
+    calls = []
+    failing = set()
+
+    async def call_llm_api_async(llm_func, *args, **kwargs):
+        match = PARENT_PATTERN.search(kwargs["prompt"])
+        if match is None:
+            # Level 0 prompt: no parent actor
+            calls.append(None)
+            if None in failing:
+                raise RuntimeError("LLM failed for level 0")
+            return LEVEL_0_RESPONSE
+        parent = match.group(1)
+        calls.append(parent)
+        if parent in failing:
+            raise RuntimeError(f"LLM failed for {parent}")
+        return _subactors_response(parent)
+
+    monkeypatch.setattr(services, "call_llm_api_async", call_llm_api_async)
+    return calls, failing
+
+
+def _write_level(run_folder, level, actors):
+    (run_folder / f"Features_level_{level}.json").write_bytes(orjson.dumps({
+        "metadata": {"level": level},
+        "actors": actors
+    }))
+
+
+def _read_level(run_folder, level):
+    return orjson.loads((run_folder / f"Features_level_{level}.json").read_bytes())
+
+
+def _actor(name):
+    return {"name": name, "description": f"{name} description.", "type": "Country"}
+
+
+def test_level_0_to_1_output_shape_is_stable_for_failed_actors(tmp_path, fake_llm):
+    _, failing = fake_llm
+    failing.add("Failland")
+    _write_level(tmp_path, 0, [_actor("France"), _actor("Failland")])
+
+    enhanced = asyncio.run(GenerationService()._generate_level_n_actors_async(
+        0, 1, "anthropic", "claude-3-5-sonnet-latest", 2, tmp_path, skip_on_error=True
+    ))
+
+    assert len(enhanced) == 2
+    level_1 = _read_level(tmp_path, 1)
+    france, failland = level_1["actors"]
+    assert set(france) == set(failland) == ACTOR_KEYS
+    assert france["sub_actors_count"] == 2
+    assert failland["sub_actors"] == [] and failland["sub_actors_count"] == 0
+    assert level_1["metadata"]["generation_stats"]["failed_actors"] == 1
+
+
+def test_level_0_actor_with_sub_actors_is_kept_in_shape(tmp_path, fake_llm):
+    calls, _ = fake_llm
+    done = {**_actor("France"), "sub_actors": orjson.loads(_subactors_response("France"))["sub_actors"]}
+    _write_level(tmp_path, 0, [done])
+
+    asyncio.run(GenerationService()._generate_level_n_actors_async(
+        0, 1, "anthropic", "claude-3-5-sonnet-latest", 2, tmp_path
+    ))
+
+    assert calls == []
+    (france,) = _read_level(tmp_path, 1)["actors"]
+    assert set(france) == ACTOR_KEYS
+    assert len(france["sub_actors"]) == 2
+
+
+def test_level_1_to_2_expands_leaves_in_place(tmp_path, fake_llm):
+    calls, failing = fake_llm
+    failing.add("France Sub 1")
+    france = {**_actor("France"), "sub_actors": orjson.loads(_subactors_response("France"))["sub_actors"],
+              "sub_actors_count": 2, "parameters": []}
+    _write_level(tmp_path, 1, [france])
+
+    asyncio.run(GenerationService()._generate_level_n_actors_async(
+        1, 2, "anthropic", "claude-3-5-sonnet-latest", 2, tmp_path, skip_on_error=True
+    ))
+
+    assert sorted(calls) == ["France Sub 0", "France Sub 1"]
+    (france,) = _read_level(tmp_path, 2)["actors"]
+    expanded, failed = france["sub_actors"]
+    assert expanded["sub_actors_count"] == 2
+    assert [sub["parent_actor"] for sub in expanded["sub_actors"]] == ["France Sub 0"] * 2
+    assert failed["sub_actors"] == [] and failed["sub_actors_count"] == 0
+    assert set(failed) == set(expanded)
+
+
+def test_level_n_failure_propagates_without_skip_on_error(tmp_path, fake_llm):
+    _, failing = fake_llm
+    failing.add("France")
+    _write_level(tmp_path, 0, [_actor("France")])
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(GenerationService()._generate_level_n_actors_async(
+            0, 1, "anthropic", "claude-3-5-sonnet-latest", 2, tmp_path, skip_on_error=False
+        ))
+
+
+# _generate_level_0_actors / _generate_level_n_actors_async back the in-house path that
+# generate_actors_async keeps commented out (it delegates to actors_complete) - test them directly
+
+def test_level_0_actors_are_saved(tmp_path, fake_llm):
+    actors_list = asyncio.run(GenerationService()._generate_level_0_actors(
+        "anthropic", "claude-3-5-sonnet-latest", 2, tmp_path
+    ))
+
+    assert [actor.name for actor in actors_list.actors] == ["France", "Japan"]
+    level_0 = _read_level(tmp_path, 0)
+    assert level_0["total_count"] == 2
+    assert level_0["metadata"]["num_actors_generated"] == 2
+    assert [actor["name"] for actor in level_0["actors"]] == ["France", "Japan"]
+
+
+def test_level_0_truncated_response_keeps_complete_actors(tmp_path, fake_llm, monkeypatch):
+    pytest.importorskip("json_repair")
+    monkeypatch.setattr(sys.modules[__name__], "LEVEL_0_RESPONSE", LEVEL_0_RESPONSE[:-40])
+
+    actors_list = asyncio.run(GenerationService()._generate_level_0_actors(
+        "anthropic", "claude-3-5-sonnet-latest", 2, tmp_path
+    ))
+
+    assert [actor.name for actor in actors_list.actors] == ["France"]
+    assert _read_level(tmp_path, 0)["total_count"] == 1
+
+
+@pytest.mark.parametrize("response", ["not json at all", '{"actors": [{"name": "France"}]}'])
+def test_level_0_bad_response_returns_none(tmp_path, fake_llm, monkeypatch, response):
+    monkeypatch.setattr(sys.modules[__name__], "LEVEL_0_RESPONSE", response)
+
+    assert asyncio.run(GenerationService()._generate_level_0_actors(
+        "anthropic", "claude-3-5-sonnet-latest", 2, tmp_path
+    )) is None
+    assert not (tmp_path / "Features_level_0.json").exists()
+
+
+def test_level_0_api_error_returns_none(tmp_path, fake_llm):
+    _, failing = fake_llm
+    failing.add(None)
+
+    assert asyncio.run(GenerationService()._generate_level_0_actors(
+        "anthropic", "claude-3-5-sonnet-latest", 2, tmp_path
+    )) is None
+
+
+def _parameter_output():
+    actors = [
+        {**_actor(name), "parameters": [{"code_name": "gdp", "name": f"{name} GDP", "expected_value": 1.5}],
+         "sub_actors": [{**_actor(f"{name} Sub"), "parent_actor": name, "sub_actors": [], "parameters": []}]}
+        for name in ("France", "Côte d'Ivoire", "Japan")
+    ]
+    return {"metadata": {"level": 1, "generation_stats": {}}, "actors": actors,
+            "total_main_actors": 3, "total_subactors": 3, "level": 1}
+
+
+def _non_streaming(data):
+    return json.dumps(data, indent=2, ensure_ascii=False).encode()
+
+
+def test_streamed_parameters_match_non_streaming_output(tmp_path):
+    data = _parameter_output()
+    out_path = tmp_path / "Features_level_1_with_params.json"
+
+    writer = _StreamingParametersWriter(out_path, data, 3, "gpt-4o")
+    assert writer.open() == []
+    for actor in data["actors"]:
+        writer.write_actor(actor)
+    writer.finish()
+
+    assert out_path.read_bytes() == _non_streaming(data)
+    assert list(orjson.loads(out_path.read_bytes())) == list(data)
+
+
+def test_resumed_parameters_match_non_streaming_output(tmp_path):
+    data = _parameter_output()
+    out_path = tmp_path / "Features_level_1_with_params.json"
+
+    interrupted = _StreamingParametersWriter(out_path, data, 3, "gpt-4o")
+    interrupted.open()
+    interrupted.write_actor(data["actors"][0])
+    interrupted.close()
+
+    resumed = _StreamingParametersWriter(out_path, data, 3, "gpt-4o")
+    assert resumed.open() == data["actors"][:1]
+    for actor in data["actors"][1:]:
+        resumed.write_actor(actor)
+    resumed.finish()
+
+    assert out_path.read_bytes() == _non_streaming(data)
+    assert not resumed.progress_path.exists()
+
+
+def test_changed_settings_restart_the_stream(tmp_path):
+    data = _parameter_output()
+    out_path = tmp_path / "Features_level_1_with_params.json"
+
+    interrupted = _StreamingParametersWriter(out_path, data, 3, "gpt-4o")
+    interrupted.open()
+    interrupted.write_actor(data["actors"][0])
+    interrupted.close()
+
+    restarted = _StreamingParametersWriter(out_path, data, 5, "gpt-4o")
+    assert restarted.open() == []
+    restarted.close()
+
+
+def test_streamed_parameters_without_actors(tmp_path):
+    data = {**_parameter_output(), "actors": []}
+    out_path = tmp_path / "Features_level_1_with_params.json"
+
+    writer = _StreamingParametersWriter(out_path, data, 3, "gpt-4o")
+    writer.open()
+    writer.finish()
+
+    assert out_path.read_bytes() == _non_streaming(data)
@@ -0,0 +1,35 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+# Add the parent of 'worldmodel' to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from worldmodel.backend import utils
+from worldmodel.backend.config import get_config
+
+
+def test_call_llm_api_async_bounds_concurrency(monkeypatch):
+    monkeypatch.setattr(get_config().llm, "max_concurrent_requests", 2)
+    monkeypatch.setattr(get_config().llm, "requests_per_minute", 0)
+    monkeypatch.setattr(utils, "_llm_loop", None)
+    monkeypatch.setattr(utils, "_llm_executor", None)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def fake_llm(prompt):
+        with lock:
+            running.append(prompt)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(prompt)
+        return prompt.upper()
+
+    async def run():
+        return await asyncio.gather(*(utils.call_llm_api_async(fake_llm, prompt=f"p{i}") for i in range(6)))
+
+    assert asyncio.run(run()) == [f"P{i}" for i in range(6)]
+    assert max(peak) == 2
@@ -0,0 +1,54 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+# Add the parent of 'worldmodel' to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from worldmodel.backend.llm import llm
+from worldmodel.backend.llm.llm import MAX_RETRY_WAIT, _wait_for_retry
+
+
+def _retry_state(headers):
+    exception = RuntimeError("rate limited")
+    exception.response = SimpleNamespace(headers=headers)
+    return SimpleNamespace(outcome=SimpleNamespace(exception=lambda: exception), attempt_number=1)
+
+
+def test_retry_after_wins():
+    headers = {"retry-after": "3", "x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "20s"}
+    assert _wait_for_retry(_retry_state(headers)) == 3.0
+    assert _wait_for_retry(_retry_state({"retry-after-ms": "1500"})) == 1.5
+
+
+@pytest.mark.parametrize("reset, expected", [("20ms", 0.02), ("1.5s", 1.5), ("0m12s", 12.0), ("6m0s", MAX_RETRY_WAIT)])
+def test_openai_exhausted_window_waits_for_reset(reset, expected):
+    headers = {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": reset}
+    assert _wait_for_retry(_retry_state(headers)) == pytest.approx(expected)
+
+
+def test_longest_exhausted_window_wins():
+    headers = {
+        "x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "2s",
+        "x-ratelimit-remaining-tokens": "0", "x-ratelimit-reset-tokens": "7s",
+    }
+    assert _wait_for_retry(_retry_state(headers)) == 7.0
+
+
+def test_anthropic_exhausted_window_waits_for_reset():
+    reset_at = datetime.now(timezone.utc) + timedelta(seconds=10)
+    headers = {
+        "anthropic-ratelimit-tokens-remaining": "0",
+        "anthropic-ratelimit-tokens-reset": reset_at.isoformat().replace("+00:00", "Z"),
+    }
+    assert 8 < _wait_for_retry(_retry_state(headers)) <= 10
+
+
+def test_remaining_capacity_falls_back_to_backoff(monkeypatch):
+    monkeypatch.setattr(llm, "_exponential_wait", lambda retry_state: 42.0)
+    headers = {"x-ratelimit-remaining-requests": "5", "x-ratelimit-reset-requests": "20s"}
+    assert _wait_for_retry(_retry_state(headers)) == 42.0
+    assert _wait_for_retry(_retry_state({"x-ratelimit-remaining-requests": "0",
+                                         "x-ratelimit-reset-requests": "soon"})) == 42.0
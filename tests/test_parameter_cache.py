@@ -0,0 +1,142 @@
+import os
+import sys
+
+import pytest
+
+# Add the parent of 'worldmodel' to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from worldmodel.backend import parameter_cache
+from worldmodel.backend.config import get_config
+from worldmodel.backend.parameter_cache import ParameterCache, get_parameter_cache, retarget_parameters
+
+MODEL = "claude-3-5-sonnet-latest"
+
+FRANCE = {"name": "France", "type": "Country", "description": "A large European economy."}
+PARAMS = [{"code_name": "gdp", "name": "France GDP", "description": "GDP of France.",
+           "type": "float", "expected_value": "3e12"}]
+
+
+class _FakeEmbeddingModel:
+    """Bag-of-words embedding: descriptions sharing their words embed close together"""
+
+    def encode(self, texts, normalize_embeddings=True):
+        np = pytest.importorskip("numpy")
+        vectors = np.zeros((len(texts), 64), dtype="float32")
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, sum(map(ord, word)) % 64] += 1.0
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class _FakeFlatIPIndex:
+    """Exhaustive inner-product search with faiss.IndexFlatIP's add/search interface"""
+
+    def __init__(self, dim):
+        self.vectors = []
+
+    def add(self, vector):
+        self.vectors.extend(vector)
+
+    def search(self, vector, k):
+        np = pytest.importorskip("numpy")
+        scores = [float(np.dot(vector[0], stored)) for stored in self.vectors]
+        best = int(np.argmax(scores))
+        return np.array([[scores[best]]]), np.array([[best]])
+
+
+class _FakeFaiss:
+    IndexFlatIP = _FakeFlatIPIndex
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParameterCache(tmp_path / "cache.sqlite")
+
+
+@pytest.fixture
+def semantic_cache(tmp_path, monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr(parameter_cache, "_load_semantic_backend", lambda: (_FakeFaiss, _FakeEmbeddingModel()))
+    return ParameterCache(tmp_path / "cache.sqlite", similarity_threshold=0.9, semantic=True)
+
+
+def test_exact_hit(cache):
+    cache.put(FRANCE, 1, MODEL, PARAMS)
+    assert cache.get(dict(FRANCE), 1, MODEL) == PARAMS
+
+
+def test_exact_hit_survives_reopening(tmp_path):
+    ParameterCache(tmp_path / "cache.sqlite").put(FRANCE, 1, MODEL, PARAMS)
+    assert ParameterCache(tmp_path / "cache.sqlite").get(FRANCE, 1, MODEL) == PARAMS
+
+
+@pytest.mark.parametrize("change", [
+    {"name": "Germany"},
+    {"description": "A small alpine economy."},
+    {"type": "Company"},
+])
+def test_miss_on_different_actor(cache, change):
+    cache.put(FRANCE, 1, MODEL, PARAMS)
+    assert cache.get({**FRANCE, **change}, 1, MODEL) is None
+
+
+def test_miss_on_different_settings(cache):
+    cache.put(FRANCE, 1, MODEL, PARAMS)
+    assert cache.get(FRANCE, 2, MODEL) is None
+    assert cache.get(FRANCE, 1, "gpt-4o") is None
+
+
+def test_empty_parameters_are_not_cached(cache):
+    cache.put(FRANCE, 1, MODEL, [])
+    assert cache.get(FRANCE, 1, MODEL) is None
+
+
+def test_similar_actor_misses_without_semantic_matching(cache):
+    cache.put(FRANCE, 1, MODEL, PARAMS)
+    assert cache.get({**FRANCE, "name": "Republic of France"}, 1, MODEL) is None
+
+
+def test_semantic_hit_is_retargeted(semantic_cache):
+    semantic_cache.put(FRANCE, 1, MODEL, PARAMS)
+
+    params = semantic_cache.get({**FRANCE, "name": "Germany"}, 1, MODEL)
+
+    assert params[0]["name"] == "Germany GDP"
+    assert params[0]["description"] == "GDP of Germany."
+    assert params[0]["code_name"] == "gdp"
+
+
+def test_semantic_miss_below_threshold(semantic_cache):
+    semantic_cache.put(FRANCE, 1, MODEL, PARAMS)
+    other = {"name": "Shell", "type": "Country", "description": "Oil and gas producer with global reach."}
+    assert semantic_cache.get(other, 1, MODEL) is None
+
+
+def test_semantic_match_needs_same_type(semantic_cache):
+    semantic_cache.put(FRANCE, 1, MODEL, PARAMS)
+    assert semantic_cache.get({**FRANCE, "name": "Germany", "type": "Company"}, 1, MODEL) is None
+
+
+def test_retarget_parameters_swaps_the_name_in_text_fields():
+    params = [{**PARAMS[0], "expected_value": 3e12}]
+
+    retargeted = retarget_parameters(params, "France", "Germany")
+
+    assert retargeted == [{"code_name": "gdp", "name": "Germany GDP", "description": "GDP of Germany.",
+                           "type": "float", "expected_value": 3e12}]
+    assert params[0]["name"] == "France GDP"
+
+
+def test_retarget_parameters_leaves_same_name_untouched():
+    assert retarget_parameters(PARAMS, "France", "France") is PARAMS
+
+
+def test_disabled_cache(monkeypatch):
+    monkeypatch.setattr(get_config(), "parameter_cache_enabled", False)
+    assert get_parameter_cache() is None
+
+
+def test_semantic_matching_is_off_by_default():
+    config = get_config()
+    assert config.parameter_cache_enabled
+    assert not config.parameter_cache_semantic
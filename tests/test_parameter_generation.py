@@ -0,0 +1,170 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the parent of 'worldmodel' to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from worldmodel.backend import services
+from worldmodel.backend.services import GenerationService
+
+MODEL = "claude-3-5-sonnet-latest"
+
+
+def _params(actor):
+    return [{"code_name": "gdp", "name": f"{actor['name']} GDP", "description": f"GDP of {actor['name']}.",
+             "type": "float", "expected_value": "1e12"}]
+
+
+def _actor(name, description="A large European economy."):
+    return {"name": name, "description": description, "type": "Country"}
+
+
+class FakeParameterLLM:
+    """Stand-in for call_llm_api_async: records batch / single calls and can hold or fail them"""
+
+    def __init__(self):
+        self.batches = []
+        self.singles = []
+        self.batch_drops = set()  # positions the batch response leaves out
+        self.fail = False
+        self.started = asyncio.Event()
+        self.release = None
+
+    async def __call__(self, llm_func, actors_or_actor, num_params, provider, model):
+        self.started.set()
+        if self.release is not None:
+            await self.release.wait()
+        if self.fail:
+            raise RuntimeError("LLM failed")
+        if llm_func is services.generate_parameters_for_actor_batch:
+            self.batches.append([actor["name"] for actor in actors_or_actor])
+            return {position: _params(actor) for position, actor in enumerate(actors_or_actor)
+                    if position not in self.batch_drops}
+        self.singles.append(actors_or_actor["name"])
+        return _params(actors_or_actor)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    monkeypatch.setattr(services, "get_parameter_cache", lambda: None)
+    fake = FakeParameterLLM()
+    monkeypatch.setattr(services, "call_llm_api_async", fake)
+    return fake
+
+
+class _WatchedInflight(dict):
+    """GenerationService._inflight that signals once a second run has looked up its actors"""
+
+    def __init__(self):
+        super().__init__()
+        self.lookups = 0
+        self.second_run_registered = asyncio.Event()
+
+    def get(self, key, default=None):
+        self.lookups += 1
+        if self.lookups == 2:
+            self.second_run_registered.set()
+        return super().get(key, default)
+
+
+def _add_parameters(service, actors, on_actor_done=None):
+    return service._add_parameters_concurrently_async(actors, 1, "anthropic", MODEL, on_actor_done)
+
+
+def test_batch_fills_every_actor(fake_llm):
+    actors = [_actor("France"), _actor("Japan", "A large Asian economy.")]
+    done = []
+
+    asyncio.run(_add_parameters(GenerationService(), actors, done.append))
+
+    assert fake_llm.batches == [["France", "Japan"]] and fake_llm.singles == []
+    assert [actor["parameters"] for actor in actors] == [_params(actor) for actor in actors]
+    assert done == actors
+
+
+def test_batch_missing_entries_fall_back_to_single_calls(fake_llm):
+    fake_llm.batch_drops = {1}
+    actors = [_actor("France"), _actor("Japan", "A large Asian economy."), _actor("Peru", "An Andean economy.")]
+
+    asyncio.run(_add_parameters(GenerationService(), actors))
+
+    assert fake_llm.singles == ["Japan"]
+    assert [actor["parameters"] for actor in actors] == [_params(actor) for actor in actors]
+
+
+def test_unparseable_batch_falls_back_for_every_actor(fake_llm, monkeypatch):
+    real_fake = services.call_llm_api_async
+
+    async def batch_returns_none(llm_func, *args):
+        if llm_func is services.generate_parameters_for_actor_batch:
+            return None
+        return await real_fake(llm_func, *args)
+
+    monkeypatch.setattr(services, "call_llm_api_async", batch_returns_none)
+    actors = [_actor("France"), _actor("Japan", "A large Asian economy.")]
+
+    asyncio.run(_add_parameters(GenerationService(), actors))
+
+    assert fake_llm.singles == ["France", "Japan"]
+    assert all(actor["parameters"] for actor in actors)
+
+
+def test_duplicate_actors_share_one_generation(fake_llm):
+    actors = [_actor("France"), _actor("French Republic")]
+    done = []
+
+    asyncio.run(_add_parameters(GenerationService(), actors, done.append))
+
+    assert fake_llm.batches == [["France"]] and fake_llm.singles == []
+    france, republic = actors
+    # The follower's parameters are retargeted to its own name, and are its own copies
+    assert republic["parameters"][0]["name"] == "French Republic GDP"
+    assert republic["parameters"][0]["description"] == "GDP of French Republic."
+    assert france["parameters"][0]["name"] == "France GDP"
+    assert sorted(actor["name"] for actor in done) == ["France", "French Republic"]
+
+
+def test_follower_in_another_run_waits_for_the_leader(fake_llm):
+    service = GenerationService()
+    service._inflight = _WatchedInflight()
+    france, republic = _actor("France"), _actor("French Republic")
+
+    async def run():
+        fake_llm.release = asyncio.Event()
+        leader = asyncio.create_task(_add_parameters(service, [france]))
+        await fake_llm.started.wait()
+        follower = asyncio.create_task(_add_parameters(service, [republic]))
+        await service._inflight.second_run_registered.wait()
+        fake_llm.release.set()
+        await asyncio.gather(leader, follower)
+
+    asyncio.run(run())
+
+    assert fake_llm.batches == [["France"]]
+    assert republic["parameters"][0]["name"] == "French Republic GDP"
+    assert service._inflight == {}
+
+
+def test_follower_in_another_run_fails_with_the_leader(fake_llm):
+    service = GenerationService()
+    service._inflight = _WatchedInflight()
+    france, republic = _actor("France"), _actor("French Republic")
+
+    async def run():
+        fake_llm.release = asyncio.Event()
+        fake_llm.fail = True
+        leader = asyncio.create_task(_add_parameters(service, [france]))
+        await fake_llm.started.wait()
+        follower = asyncio.create_task(_add_parameters(service, [republic]))
+        await service._inflight.second_run_registered.wait()
+        fake_llm.release.set()
+        return await asyncio.gather(leader, follower, return_exceptions=True)
+
+    leader_result, follower_result = asyncio.run(run())
+
+    assert str(leader_result) == "LLM failed"
+    assert isinstance(follower_result, RuntimeError) and "Duplicate actor" in str(follower_result)
+    assert "parameters" not in republic
+    assert service._inflight == {}
@@ -0,0 +1,54 @@
+import os
+import sys
+
+import orjson
+import pytest
+
+# Add the parent of 'worldmodel' to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from worldmodel.backend.models import SubActorList
+from worldmodel.backend.utils import parse_llm_actor_list
+
+pytest.importorskip("json_repair")
+
+SUBACTOR_FIELDS = ('name', 'description', 'type', 'parent_actor')
+
+
+def _subactor_response(count: int) -> str:
+    return orjson.dumps({
+        "sub_actors": [
+            {"name": f"Ministry {i}", "description": f"Ministry number {i}.",
+             "type": "Government", "parent_actor": "France"}
+            for i in range(count)
+        ],
+        "parent_actor": "France"
+    }).decode()
+
+
+def test_valid_response_is_returned_unchanged():
+    response = _subactor_response(3)
+    assert parse_llm_actor_list(response, "sub_actors") == orjson.loads(response)
+
+
+def test_truncated_response_keeps_complete_sub_actors():
+    response = _subactor_response(3)
+    # Cut off inside the third sub-actor's description, as at max_tokens
+    truncated = response[:response.index("Ministry number 2") + 10]
+
+    data = parse_llm_actor_list(
+        truncated, "sub_actors", required_fields=SUBACTOR_FIELDS, parent_actor="France"
+    )
+    data["total_count"] = len(data["sub_actors"])
+    sub_actors = SubActorList(**data)
+
+    assert [actor.name for actor in sub_actors.sub_actors] == ["Ministry 0", "Ministry 1"]
+    assert sub_actors.parent_actor == "France"
+    assert sub_actors.total_count == 2
+
+
+def test_truncated_response_without_complete_entries_raises():
+    response = _subactor_response(1)
+    truncated = response[:response.index("Ministry number 0")]
+
+    with pytest.raises(orjson.JSONDecodeError):
+        parse_llm_actor_list(truncated, "sub_actors", required_fields=SUBACTOR_FIELDS)
@@ -0,0 +1,42 @@
+import os
+import sys
+
+# Add the parent of 'worldmodel' to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from worldmodel.backend.utils import get_run_info
+
+
+def test_missing_run_folder(tmp_path):
+    assert get_run_info(tmp_path / "run_missing") == {"status": "not_found"}
+
+
+def test_unchanged_run_folder_is_served_from_cache(tmp_path):
+    (tmp_path / "Features_level_0.json").write_text("{}")
+
+    first = get_run_info(tmp_path)
+    assert first["status"] == "found"
+    assert get_run_info(tmp_path) is first
+
+
+def test_in_place_rewrite_refreshes_cached_info(tmp_path):
+    level_file = tmp_path / "Features_level_0.json"
+    level_file.write_text("x")
+    folder_stat = tmp_path.stat()
+    assert get_run_info(tmp_path)["level_files"][0]["size"] == 1
+
+    # Rewriting an existing file in place leaves the folder's mtime alone
+    with open(level_file, "w") as f:
+        f.write("x" * 5002)
+    os.utime(tmp_path, ns=(folder_stat.st_atime_ns, folder_stat.st_mtime_ns))
+
+    assert get_run_info(tmp_path)["level_files"][0]["size"] == 5002
+
+
+def test_new_level_file_is_picked_up(tmp_path):
+    (tmp_path / "Features_level_0.json").write_text("{}")
+    assert get_run_info(tmp_path)["total_levels"] == 1
+
+    (tmp_path / "Features_level_1.json").write_text("{}")
+    info = get_run_info(tmp_path)
+    assert info["total_levels"] == 2
+    assert [f["file"] for f in info["level_files"]] == ["Features_level_0.json", "Features_level_1.json"]
@@ -0,0 +1,45 @@
+import asyncio
+import os
+import sys
+
+import orjson
+
+# Add the parent of 'worldmodel' to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+from worldmodel.backend.utils import save_level_data, save_level_data_async
+
+DATA = {"metadata": {"level": 0}, "actors": [{"name": "Côte d'Ivoire"}], "total_count": 1}
+
+
+def _save(run_folder, data, use_async):
+    if use_async:
+        return asyncio.run(save_level_data_async(data, 0, run_folder))
+    return save_level_data(data, 0, run_folder)
+
+
+def test_saves_indented_json_without_temp_files(tmp_path):
+    for use_async in (False, True):
+        assert _save(tmp_path, DATA, use_async) == str(tmp_path / "Features_level_0.json")
+        assert (tmp_path / "Features_level_0.json").read_bytes() == orjson.dumps(DATA, option=orjson.OPT_INDENT_2)
+        assert [path.name for path in tmp_path.iterdir()] == ["Features_level_0.json"]
+
+
+def test_failed_save_keeps_the_previous_file(tmp_path):
+    save_level_data(DATA, 0, tmp_path)
+    before = (tmp_path / "Features_level_0.json").read_bytes()
+
+    for use_async in (False, True):
+        assert _save(tmp_path, {**DATA, "actors": [object()]}, use_async) is None
+        assert (tmp_path / "Features_level_0.json").read_bytes() == before
+        assert [path.name for path in tmp_path.iterdir()] == ["Features_level_0.json"]
+
+
+def test_replaces_rather_than_rewrites_in_place(tmp_path):
+    save_level_data(DATA, 0, tmp_path)
+    inode = (tmp_path / "Features_level_0.json").stat().st_ino
+    with open(tmp_path / "Features_level_0.json", "rb") as reader:
+        save_level_data({**DATA, "total_count": 2}, 0, tmp_path)
+        # An open reader keeps seeing the complete old file, never a truncated one
+        assert orjson.loads(reader.read()) == DATA
+
+    assert (tmp_path / "Features_level_0.json").stat().st_ino != inode